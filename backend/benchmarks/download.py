@@ -0,0 +1,69 @@
+"""
+Benchmark the concurrent kline downloader against a local fake Binance server.
+
+Run from the backend directory:
+
+    python -m benchmarks.download                         # 200k bars, 1 vs 8 workers
+    python -m benchmarks.download --latency 0.1 --fail-every 7
+
+Every run downloads the same range and is checked against the server's bars, so
+ordering, duplicates and retries are verified along with the timing.
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from trading_bot.downloader import KlineDownloader
+
+from .fake_server import FakeBinanceServer
+from .synthetic import DEFAULT_START_MS
+
+SYMBOL = 'ETHUSDT'
+
+
+def run_download(server, interval, workers, weight_limit):
+    downloader = KlineDownloader(server.url, max_workers=workers, weight_limit=weight_limit, backoff=0.05)
+    requests_before = server.requests
+    start = time.perf_counter()
+    try:
+        rows = downloader.get_historical_klines(SYMBOL, interval, DEFAULT_START_MS)
+    finally:
+        downloader.close()
+    seconds = time.perf_counter() - start
+    open_times = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    expected = server.client.open_times[(SYMBOL, interval)]
+    return {
+        "workers": workers,
+        "bars": len(rows),
+        "seconds": seconds,
+        "requests": server.requests - requests_before,
+        "correct": bool(np.array_equal(open_times, expected))
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bars', type=int, default=200_000)
+    parser.add_argument('--interval', default='5m')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--latency', type=float, default=0.05, help="seconds added to every response")
+    parser.add_argument('--weight-limit', type=int, default=6000)
+    parser.add_argument('--fail-every', type=int, help="answer every n-th request with a 503")
+    args = parser.parse_args(argv)
+
+    with FakeBinanceServer.synthetic(args.bars, symbols=(SYMBOL,), intervals=(args.interval,),
+                                     latency=args.latency, weight_limit=args.weight_limit,
+                                     fail_every=args.fail_every) as server:
+        results = [run_download(server, args.interval, workers, args.weight_limit) for workers in args.workers]
+        print(f"{'workers':>8}{'bars':>10}{'seconds':>10}{'requests':>10}{'bars/sec':>12}  correct")
+        for r in results:
+            print(f"{r['workers']:>8}{r['bars']:>10}{r['seconds']:>10.2f}{r['requests']:>10}"
+                  f"{r['bars'] / r['seconds']:>12,.0f}  {r['correct']}")
+        print(f"max concurrent requests: {server.max_concurrent}, rejected with 429: {server.rejected}")
+    return 0 if all(r["correct"] for r in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
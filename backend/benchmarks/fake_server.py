@@ -0,0 +1,120 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .synthetic import FakeBinanceClient
+
+
+class FakeBinanceServer:
+    """
+    Local HTTP server that answers /api/v3/klines from a FakeBinanceClient.
+
+    Responses carry X-MBX-USED-WEIGHT-1m like the real API and requests over
+    weight_limit per minute get a 429 with Retry-After. latency adds a fixed delay to
+    every response and fail_every makes every n-th request return a 503, to exercise
+    the downloader's concurrency, rate limiting and retries without the network.
+
+        with FakeBinanceServer(FakeBinanceClient.synthetic(100_000)) as server:
+            KlineDownloader(server.url).get_historical_klines('ETHUSDT', '5m', start)
+    """
+
+    def __init__(self, client, latency=0.0, weight_limit=6000, request_weight=2, fail_every=None):
+        self.client = client
+        self.latency = latency
+        self.weight_limit = weight_limit
+        self.request_weight = request_weight
+        self.fail_every = fail_every
+        self.requests = 0
+        self.rejected = 0
+        self.max_concurrent = 0
+        self._active = 0
+        self._window = (0, 0)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @classmethod
+    def synthetic(cls, n, symbols=('ETHUSDT',), intervals=('5m',), **kwargs):
+        return cls(FakeBinanceClient.synthetic(n, symbols, intervals), **kwargs)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def _account(self):
+        """
+        Count one request and return (status, used weight in the current minute).
+        """
+        with self._lock:
+            self.requests += 1
+            minute = int(time.time() // 60)
+            window_minute, used = self._window
+            used = (used if window_minute == minute else 0) + self.request_weight
+            self._window = (minute, used)
+            if used > self.weight_limit:
+                self.rejected += 1
+                return 429, used
+            if self.fail_every and self.requests % self.fail_every == 0:
+                return 503, used
+            return 200, used
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path != '/api/v3/klines':
+                    self.send_error(404)
+                    return
+                query = {k: v[0] for k, v in parse_qs(url.query).items()}
+                with server._lock:
+                    server._active += 1
+                    server.max_concurrent = max(server.max_concurrent, server._active)
+                try:
+                    status, used = server._account()
+                    time.sleep(server.latency)
+                    if status == 200:
+                        rows = server.client.get_historical_klines(
+                            query['symbol'], query['interval'],
+                            int(query['startTime']) if 'startTime' in query else None,
+                            int(query['endTime']) if 'endTime' in query else None,
+                            limit=int(query.get('limit', 500)))
+                        body = json.dumps(rows).encode()
+                    else:
+                        body = json.dumps({"code": -1003, "msg": "Too many requests."}).encode()
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.send_header('X-MBX-USED-WEIGHT-1m', str(used))
+                    if status == 429:
+                        self.send_header('Retry-After', str(60 - int(time.time()) % 60))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with server._lock:
+                        server._active -= 1
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,145 @@
+"""
+Benchmark the data -> indicators -> signals -> backtest pipeline on synthetic bars.
+
+Run from the backend directory:
+
+    python -m benchmarks.pipeline                      # 10k, 100k and 1M bars
+    python -m benchmarks.pipeline --save-baseline      # record benchmarks/baseline.json
+    python -m benchmarks.pipeline --check              # fail if slower than the baseline
+
+Each stage reports the best wall time over --repeat runs, peak traced memory and
+throughput in bars/sec. Klines come from FakeBinanceClient, so no network is used.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from trading_bot import (
+    get_historical_data,
+    compute_indicators,
+    generate_signals,
+    backtest_strategy
+)
+
+from .synthetic import DEFAULT_START_MS, FakeBinanceClient
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+SYMBOL = 'ETHUSDT'
+
+
+def pipeline_stages(client, interval, timeframe):
+    """
+    Return the pipeline as (name, fn) pairs; each fn takes the previous stage's output.
+    """
+    return [
+        ("get_historical_data", lambda _: get_historical_data(client, SYMBOL, interval, DEFAULT_START_MS)),
+        ("compute_indicators", lambda df: compute_indicators(df, timeframe)),
+        ("generate_signals", lambda df: generate_signals(df, timeframe)),
+        ("backtest_strategy", lambda df: backtest_strategy(df)),
+    ]
+
+
+def measure(fn, arg, repeat):
+    """
+    Return (output, best wall time in seconds, peak traced memory in bytes) for fn(arg).
+    """
+    best = float('inf')
+    output = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = fn(arg)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return output, best, peak
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=3, interval='5m', timeframe='5m'):
+    results = []
+    for n in sizes:
+        client = FakeBinanceClient.synthetic(n, symbols=(SYMBOL,), intervals=(interval,))
+        output = None
+        for stage, fn in pipeline_stages(client, interval, timeframe):
+            output, seconds, peak = measure(fn, output, repeat)
+            results.append({
+                "stage": stage,
+                "bars": n,
+                "seconds": seconds,
+                "peak_mb": peak / 2**20,
+                "bars_per_sec": n / seconds if seconds else float('inf')
+            })
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Return the results that are slower than the baseline by more than tolerance (0.2 = 20%).
+    """
+    reference = {(r["stage"], r["bars"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        base = reference.get((result["stage"], result["bars"]))
+        if base and result["seconds"] > base["seconds"] * (1 + tolerance):
+            regressions.append({**result, "baseline_seconds": base["seconds"],
+                                "slowdown": result["seconds"] / base["seconds"]})
+    return regressions
+
+
+def print_table(results, regressions=()):
+    slow = {(r["stage"], r["bars"]): r["slowdown"] for r in regressions}
+    print(f"{'stage':<22}{'bars':>10}{'seconds':>12}{'peak MB':>10}{'bars/sec':>14}")
+    for r in results:
+        flag = f"  REGRESSION x{slow[(r['stage'], r['bars'])]:.2f}" if (r["stage"], r["bars"]) in slow else ""
+        print(f"{r['stage']:<22}{r['bars']:>10}{r['seconds']:>12.4f}{r['peak_mb']:>10.1f}{r['bars_per_sec']:>14,.0f}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--timeframe', default='5m', help="signal parameter set (5m or 1h)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--check', action='store_true', help="exit with status 1 on regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--output', help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.repeat, timeframe=args.timeframe)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results
+    }
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+    print_table(results, regressions)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+    if regressions:
+        print(f"{len(regressions)} stage(s) slower than baseline by more than {args.tolerance:.0%}")
+        if args.check:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
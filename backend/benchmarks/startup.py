@@ -0,0 +1,107 @@
+"""
+Benchmark import time of the trading_bot package and the API server.
+
+Run from the backend directory:
+
+    python -m benchmarks.startup                 # best of 5 fresh interpreters per scenario
+    python -m benchmarks.startup --check         # exit 1 if over budget or a heavy module loaded
+
+Each scenario runs in a new interpreter, so nothing is cached in sys.modules. Besides
+the wall time, every scenario lists the optional dependencies it must not load: the
+headless backtest core should need nothing beyond NumPy and pandas.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLOTTING_MODULES = ('matplotlib', 'seaborn', 'tabulate')
+HEAVY_MODULES = PLOTTING_MODULES + ('pandas_ta', 'binance')
+
+# (name, statement, budget in seconds, modules that must stay unloaded)
+SCENARIOS = (
+    ("numpy+pandas", "import numpy, pandas", None, HEAVY_MODULES),
+    ("package", "import trading_bot", 0.1, HEAVY_MODULES + ('numpy', 'pandas')),
+    ("core", "from trading_bot import get_historical_data, compute_indicators, "
+             "generate_signals, backtest_strategy", 1.0, HEAVY_MODULES + ('requests',)),
+    ("server", "import server", 2.0, HEAVY_MODULES),
+    # Pool workers re-import the entry point, so it must load nothing at all
+    ("entry", "import app", 0.1, HEAVY_MODULES + ('flask', 'pyarrow', 'requests', 'numpy', 'trading_bot')),
+)
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+exec({statement!r})
+seconds = time.perf_counter() - start
+print(json.dumps({{"seconds": seconds, "loaded": [m for m in {forbidden!r} if m in sys.modules]}}))
+"""
+
+
+def measure(statement, forbidden, repeat):
+    """
+    Return (best import time in seconds, forbidden modules that were loaded) over repeat fresh interpreters.
+    """
+    best = float('inf')
+    loaded = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', PROBE.format(statement=statement, forbidden=forbidden)],
+                                cwd=BACKEND_DIR, capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        best = min(best, result["seconds"])
+        loaded = result["loaded"]
+    return best, loaded
+
+
+def run_benchmarks(scenarios=SCENARIOS, repeat=5, scale=1.0):
+    results = []
+    for name, statement, budget, forbidden in scenarios:
+        seconds, loaded = measure(statement, forbidden, repeat)
+        budget = budget * scale if budget is not None else None
+        results.append({
+            "scenario": name,
+            "seconds": seconds,
+            "budget": budget,
+            "loaded": loaded,
+            "ok": not loaded and (budget is None or seconds <= budget)
+        })
+    return results
+
+
+def print_table(results):
+    print(f"{'scenario':<16}{'seconds':>10}{'budget':>10}  status")
+    for r in results:
+        budget = f"{r['budget']:.2f}" if r["budget"] is not None else "-"
+        status = "ok" if r["ok"] else "OVER BUDGET" if not r["loaded"] else f"LOADED {', '.join(r['loaded'])}"
+        print(f"{r['scenario']:<16}{r['seconds']:>10.3f}{budget:>10}  {status}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--scenarios', nargs='+', choices=[s[0] for s in SCENARIOS],
+                        default=[s[0] for s in SCENARIOS])
+    parser.add_argument('--budget-scale', type=float, default=1.0, help="multiply every budget, e.g. on slow CI machines")
+    parser.add_argument('--check', action='store_true', help="exit with status 1 when a scenario fails")
+    parser.add_argument('--output', help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    scenarios = [s for s in SCENARIOS if s[0] in args.scenarios]
+    results = run_benchmarks(scenarios, args.repeat, args.budget_scale)
+    print_table(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    failed = [r for r in results if not r["ok"]]
+    if failed:
+        print(f"{len(failed)} scenario(s) over budget or loading optional dependencies")
+        if args.check:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
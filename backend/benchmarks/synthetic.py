@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+from trading_bot.klines import INTERVAL_MS, to_milliseconds
+
+DEFAULT_START_MS = 1_704_067_200_000  # 2024-01-01 00:00:00 UTC
+
+
+def synthetic_ohlcv(n, interval='5m', start_ms=DEFAULT_START_MS, seed=0, price=2000.0, volatility=0.002):
+    """
+    Generate n bars of a geometric random walk as OHLCV arrays keyed like the kline fields.
+    """
+    rng = np.random.default_rng(seed)
+    step = INTERVAL_MS[interval]
+    close = price * np.exp(np.cumsum(rng.normal(0.0, volatility, n)))
+    open_ = np.concatenate(([price], close[:-1]))
+    spread = np.abs(rng.normal(0.0, volatility, n)) * close
+    open_time = start_ms + np.arange(n, dtype=np.int64) * step
+    return {
+        "open_time": open_time,
+        "open": open_,
+        "high": np.maximum(open_, close) + spread,
+        "low": np.minimum(open_, close) - spread,
+        "close": close,
+        "volume": rng.gamma(2.0, 50.0, n),
+        "close_time": open_time + step - 1,
+        "trades": rng.integers(50, 5000, n)
+    }
+
+
+def synthetic_frame(n, interval='5m', **kwargs):
+    """
+    Return synthetic bars in the DataFrame shape produced by get_historical_data.
+    """
+    bars = synthetic_ohlcv(n, interval, **kwargs)
+    index = pd.Index(pd.to_datetime(bars["open_time"], unit="ms"), name="Date")
+    return pd.DataFrame({
+        "Open": bars["open"], "High": bars["high"], "Low": bars["low"],
+        "Close": bars["close"], "Volume": bars["volume"]
+    }, index=index)
+
+
+def synthetic_klines(n, interval='5m', **kwargs):
+    """
+    Return synthetic bars as raw Binance kline rows (numbers as strings, like the REST API).
+    """
+    bars = synthetic_ohlcv(n, interval, **kwargs)
+    quote_volume = bars["volume"] * bars["close"]
+    columns = [
+        bars["open_time"].tolist(),
+        [repr(x) for x in bars["open"].tolist()],
+        [repr(x) for x in bars["high"].tolist()],
+        [repr(x) for x in bars["low"].tolist()],
+        [repr(x) for x in bars["close"].tolist()],
+        [repr(x) for x in bars["volume"].tolist()],
+        bars["close_time"].tolist(),
+        [repr(x) for x in quote_volume.tolist()],
+        bars["trades"].tolist(),
+        [repr(x) for x in (bars["volume"] / 2).tolist()],
+        [repr(x) for x in (quote_volume / 2).tolist()],
+        ["0"] * n
+    ]
+    return [list(row) for row in zip(*columns)]
+
+
+class FakeBinanceClient:
+    """
+    Stand-in for binance.client.Client that serves pre-generated klines from memory.
+
+    Only the kline methods used by the pipeline are implemented. Calls are recorded in
+    self.calls so tests and benchmarks can check how much was requested.
+    """
+
+    def __init__(self, klines_by_key):
+        self.klines = {}
+        self.open_times = {}
+        self.calls = []
+        for key, klines in klines_by_key.items():
+            self.klines[key] = klines
+            self.open_times[key] = np.fromiter((k[0] for k in klines), dtype=np.int64, count=len(klines))
+
+    @classmethod
+    def synthetic(cls, n, symbols=('ETHUSDT',), intervals=('5m',), **kwargs):
+        return cls({
+            (symbol, interval): synthetic_klines(n, interval, seed=seed, **kwargs)
+            for seed, (symbol, interval) in enumerate((s, i) for s in symbols for i in intervals)
+        })
+
+    def get_historical_klines(self, symbol, interval, start_str=None, end_str=None, limit=None, **kwargs):
+        self.calls.append((symbol, interval, start_str, end_str))
+        open_times = self.open_times[(symbol, interval)]
+        start = 0 if start_str is None else np.searchsorted(open_times, to_milliseconds(start_str))
+        stop = len(open_times) if end_str is None else np.searchsorted(open_times, to_milliseconds(end_str), side='right')
+        if limit is not None:
+            stop = min(stop, start + limit)
+        return self.klines[(symbol, interval)][start:stop]
+
+    def get_historical_klines_generator(self, symbol, interval, start_str=None, end_str=None, limit=None, **kwargs):
+        for row in self.get_historical_klines(symbol, interval, start_str, end_str, limit):
+            yield row
+
+    def get_klines(self, symbol, interval, startTime=None, endTime=None, limit=500, **kwargs):
+        return self.get_historical_klines(symbol, interval, startTime, endTime, limit=limit)
@@ -0,0 +1,656 @@
+from flask import Flask, Response, request, jsonify, stream_with_context
+from flask_cors import CORS
+from trading_bot import (
+    KlineStore,
+    run_backtest_jobs,
+    run_optimization,
+    run_portfolio,
+    run_walk_forward,
+    run_monte_carlo,
+    LiveTrader,
+    BinanceKlineFeed,
+    run_live,
+    JobQueue,
+    QueueFull,
+    job_key,
+    ResultStore,
+    KlineDownloader,
+    LRUCache,
+    ArrayCache,
+    chart_payload,
+    DOWNSAMPLE_METHODS,
+    to_milliseconds,
+    render_prometheus
+)
+import pandas as pd
+from datetime import datetime, timedelta
+import os
+import re
+import logging
+
+app = Flask(__name__)
+CORS(app, resources={r"/api/*": {"origins": "http://localhost:3000"}}) 
+
+# Loglama ayarlarını yapın; işlem başına satırlar varsayılan olarak kapalıdır
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper())
+logging.getLogger('trading_bot.trades').setLevel(os.getenv('TRADE_LOG_LEVEL', 'WARNING').upper())
+
+# Paylaşılan nesneler; iş durumu global değişkenler yerine her işin kendi nesnesinde tutulur
+kline_store = KlineStore()
+# Mum verileri herkese açık uç noktadan, ağırlık sınırına uyan eşzamanlı sayfalarla indirilir
+kline_downloader = KlineDownloader.for_binance(testnet=True, max_workers=int(os.getenv('DOWNLOAD_WORKERS', 4)))
+results_store = ResultStore()
+backtest_queue = JobQueue(max_workers=int(os.getenv('BACKTEST_WORKERS', 2)),
+                          max_pending=int(os.getenv('BACKTEST_MAX_PENDING', 16)))
+bot_queue = JobQueue(max_workers=1, max_pending=0)
+# Küçültülmüş grafik yanıtları (sembol, zaman dilimi, aralık, genişlik) anahtarıyla önbelleklenir
+chart_cache = LRUCache(maxsize=int(os.getenv('CHART_CACHE_SIZE', 256)), name='chart')
+# Gösterge ve sinyal dizileri fiyat verisinin özeti ve parametrelerle önbelleklenir; yalnızca
+# başlangıç sermayesi gibi para yönetimi girdileri değiştiğinde sadece backtest yeniden çalışır
+signal_cache = ArrayCache(maxbytes=int(os.getenv('SIGNAL_CACHE_MB', 512)) * 2**20,
+                          spill_dir=os.getenv('SIGNAL_CACHE_DIR') or None, name='signals')
+
+def parse_symbols(data):
+    """
+    Return the list of symbols in a request body and whether it was given as a list.
+    """
+    symbols = data.get('symbols')
+    if symbols:
+        return list(symbols), True
+    return [data.get('symbol', 'ETHUSDT')], False
+
+def get_start_str(historical_days):
+    """
+    Return the UTC start time string for a window of historical_days ending now.
+    """
+    past = datetime.utcnow() - timedelta(days=historical_days)
+    return past.strftime("%Y-%m-%d %H:%M:%S")
+
+def parse_backtest_params(data):
+    """
+    Read backtest parameters from a request body, with the dashboard defaults.
+    """
+    symbols, multi_symbol = parse_symbols(data)
+    return {
+        "symbols": symbols,
+        "multi_symbol": multi_symbol,
+        "historical_days": data.get('historical_days', 60),
+        "timeframes": data.get('timeframes', ['5m', '1h']),
+        "initial_capital": data.get('initial_capital', 10000)
+    }
+
+def parse_optimize_params(data):
+    """
+    Read optimization parameters from a request body, with defaults.
+    """
+    return {
+        "symbol": data.get('symbol', 'ETHUSDT'),
+        "historical_days": data.get('historical_days', 60),
+        "timeframe": data.get('timeframe', '5m'),
+        "initial_capital": data.get('initial_capital', 10000),
+        "grid": data.get('grid', {}),
+        "top": data.get('top', 20)
+    }
+
+def parse_portfolio_params(data):
+    """
+    Read portfolio backtest parameters from a request body, with defaults.
+    """
+    return {
+        "symbols": parse_symbols(data)[0],
+        "historical_days": data.get('historical_days', 60),
+        "timeframe": data.get('timeframe', '5m'),
+        "initial_capital": data.get('initial_capital', 10000),
+        "position_size": data.get('position_size', 0.1),
+        "max_positions": data.get('max_positions', 5),
+        "fee_rate": data.get('fee_rate', 0.001),
+        "slippage_pct": data.get('slippage_pct', 0.0005)
+    }
+
+def parse_walk_forward_params(data):
+    """
+    Read walk-forward parameters from a request body, with defaults.
+    """
+    return {
+        **parse_optimize_params(data),
+        "train_bars": data.get('train_bars', 5000),
+        "test_bars": data.get('test_bars', 1000),
+        "step_bars": data.get('step_bars')
+    }
+
+def parse_monte_carlo_params(data):
+    """
+    Read Monte Carlo parameters from a request body, with defaults.
+    """
+    return {
+        "symbol": data.get('symbol', 'ETHUSDT'),
+        "historical_days": data.get('historical_days', 60),
+        "timeframe": data.get('timeframe', '5m'),
+        "initial_capital": data.get('initial_capital', 10000),
+        "iterations": data.get('iterations', 5000),
+        "method": data.get('method', 'bootstrap'),
+        "confidence": data.get('confidence', 0.95)
+    }
+
+def flatten_results(jobs, symbols, with_frames=False):
+    """
+    Flatten {symbol: {timeframe: result}} into (trades, profits, frames, series) keyed by
+    timeframe, or by symbol_timeframe when several symbols were run. series maps each key
+    to its symbol and timeframe.
+    """
+    trades = {}
+    profits = []
+    frames = {}
+    series = {}
+    for symbol, by_timeframe in jobs.items():
+        for timeframe, result in by_timeframe.items():
+            key = timeframe if len(symbols) == 1 else f"{symbol}_{timeframe}"
+            trades[key] = result["trades"]
+            profits.append(result["profit"])
+            series[key] = {"symbol": symbol, "timeframe": timeframe}
+            if with_frames:
+                frames[key] = result["frame"]
+    return trades, profits, frames, series
+
+def run_backtest(job, symbols, multi_symbol, historical_days, timeframes, initial_capital):
+    app.logger.info(f"Running backtest with symbols: {symbols}, historical_days: {historical_days}, timeframes: {timeframes}, initial_capital: {initial_capital}")
+    client = kline_downloader
+    jobs = run_backtest_jobs(client, symbols, timeframes, get_start_str(historical_days),
+                             initial_capital, store=kline_store, cache=signal_cache, token=job.token)
+    results = {
+        symbol: {
+            timeframe: {
+                "trades": result["trades"],
+                "profit": result["profit"],
+                "timing": result["timing"],
+                "cached": result["cached"]
+            }
+            for timeframe, result in by_timeframe.items()
+        }
+        for symbol, by_timeframe in jobs.items()
+    }
+    results_store.save_run(job.id, *flatten_results(jobs, symbols))
+    # Tek sembol isteklerinde eski yanıt biçimini koruyun: {timeframe: {...}}
+    if not multi_symbol:
+        results = results[symbols[0]]
+    return results
+
+def run_optimize(job, symbol, historical_days, timeframe, initial_capital, grid, top):
+    app.logger.info(f"Running optimization with symbol: {symbol}, historical_days: {historical_days}, timeframe: {timeframe}, grid: {grid}")
+    client = kline_downloader
+    return run_optimization(client, symbol, timeframe, get_start_str(historical_days), grid,
+                            initial_capital=initial_capital, top=top, store=kline_store, token=job.token)
+
+def run_portfolio_backtest(job, symbols, historical_days, timeframe, **params):
+    app.logger.info(f"Running portfolio backtest with symbols: {symbols}, historical_days: {historical_days}, timeframe: {timeframe}, params: {params}")
+    client = kline_downloader
+    result = run_portfolio(client, symbols, timeframe, get_start_str(historical_days), store=kline_store,
+                           cache=signal_cache, token=job.token, **params)
+    # İşlemler sembol anahtarıyla, öz sermaye eğrisi "equity" çerçevesi olarak saklanır
+    results_store.save_run(job.id, result["trades"], list(result["profits"].values()),
+                           frames={"equity": result["equity"]},
+                           series={symbol: {"symbol": symbol, "timeframe": timeframe} for symbol in result["trades"]})
+    return {"summary": result["summary"], "profits": result["profits"]}
+
+def run_walk_forward_job(job, symbol, historical_days, timeframe, initial_capital, grid, top,
+                         train_bars, test_bars, step_bars):
+    app.logger.info(f"Running walk-forward with symbol: {symbol}, historical_days: {historical_days}, timeframe: {timeframe}, train/test bars: {train_bars}/{test_bars}")
+    client = kline_downloader
+    return run_walk_forward(client, symbol, timeframe, get_start_str(historical_days), grid, train_bars, test_bars,
+                            step_bars, initial_capital=initial_capital, store=kline_store, token=job.token)
+
+def run_monte_carlo_job(job, symbol, historical_days, timeframe, initial_capital, iterations, method, confidence):
+    app.logger.info(f"Running Monte Carlo with symbol: {symbol}, historical_days: {historical_days}, timeframe: {timeframe}, iterations: {iterations}, method: {method}")
+    client = kline_downloader
+    return run_monte_carlo(client, symbol, timeframe, get_start_str(historical_days), iterations, method,
+                           initial_capital=initial_capital, confidence=confidence, store=kline_store,
+                           cache=signal_cache, token=job.token)
+
+JOB_KINDS = {
+    "backtest": (run_backtest, parse_backtest_params),
+    "optimize": (run_optimize, parse_optimize_params),
+    "portfolio": (run_portfolio_backtest, parse_portfolio_params),
+    "walk_forward": (run_walk_forward_job, parse_walk_forward_params),
+    "monte_carlo": (run_monte_carlo_job, parse_monte_carlo_params)
+}
+
+def profile_requested(data):
+    """
+    Return whether a request asks for its job to run under the profiler.
+    """
+    return bool(data.get('profile')) or request.args.get('profile', '0') not in ('0', 'false', '')
+
+def submit_job(kind, data):
+    """
+    Queue a backtest or optimization job for a request body and return (job, deduplicated).
+    """
+    fn, parse_params = JOB_KINDS[kind]
+    params = parse_params(data)
+    profile = profile_requested(data)
+    return backtest_queue.submit(kind, fn, key=job_key(kind, {**params, "profile": profile}),
+                                 profile=profile, **params)
+
+def find_job(job_id):
+    return backtest_queue.get(job_id) or bot_queue.get(job_id)
+
+def run_trading_bot(job, symbols, historical_days, timeframes, initial_capital):
+    try:
+        app.logger.info(f"Starting trading bot for symbols: {symbols}")
+        client = kline_downloader
+        past_str = get_start_str(historical_days)
+
+        jobs = run_backtest_jobs(client, symbols, timeframes, past_str, initial_capital,
+                                 store=kline_store, return_frames=True, cache=signal_cache, token=job.token)
+        for symbol, by_timeframe in jobs.items():
+            for timeframe, result in by_timeframe.items():
+                app.logger.info(f"Processed {symbol} {timeframe} in {result['timing']['total']:.2f}s")
+        trades_all, profits, frames, series = flatten_results(jobs, symbols, with_frames=True)
+
+        # Sonuçları sütunlu biçimde bu işin kimliğiyle kaydedin; bellekte yalnızca özet tutulur
+        job.result = results_store.save_run(job.id, trades_all, profits, frames, series)
+        del frames
+
+        app.logger.info("Backtesting completed.")
+        app.logger.info(f"Total Profit/Loss: {sum(profits):.2f} USDT")
+
+        # Geçmiş verilerle ısıtılmış göstergelerle canlı döngüyü başlatın
+        traders = []
+        for symbol, by_timeframe in jobs.items():
+            for timeframe, result in by_timeframe.items():
+                trader = LiveTrader(symbol, timeframe, BinanceKlineFeed(symbol, timeframe, testnet=True),
+                                    initial_capital=initial_capital)
+                trader.seed(result.pop("frame"))
+                traders.append(trader)
+        job.state["traders"] = traders
+        if not job.token.cancelled:
+            app.logger.info(f"Starting live loop for {len(traders)} stream(s).")
+            run_live(traders, job.token)
+        app.logger.info("Live loop stopped.")
+    except Exception as e:
+        app.logger.error(f"Error in run_trading_bot: {str(e)}")
+        raise
+
+# İş kimlikleri uuid4().hex biçimindedir; başka bir değer dosya yoluna hiç eklenmez
+JOB_ID_PATTERN = re.compile(r'[0-9a-f]{32}')
+
+@app.before_request
+def check_job_id_arg():
+    """
+    Reject a ?job_id= that is not a job ID before any route uses it in a file path.
+    """
+    job_id = request.args.get('job_id')
+    if job_id and not JOB_ID_PATTERN.fullmatch(job_id):
+        return jsonify({"error": "Invalid job ID."}), 400
+
+@app.route('/', methods=['GET'])
+def home():
+    return "Flask Backend is running."
+
+@app.route('/api/start_bot', methods=['POST'])
+def start_bot():
+    try:
+        data = request.json
+        symbols, _ = parse_symbols(data)
+        historical_days = data.get('historical_days', 60)
+        timeframes = data.get('timeframes', ['5m', '1h'])
+        initial_capital = data.get('initial_capital', 10000)
+
+        # Aynı anahtar, çalışan bir bot varken ikinci bir botun başlamasını engeller
+        job, already_running = bot_queue.submit("bot", run_trading_bot, symbols, historical_days,
+                                                timeframes, initial_capital, key="bot")
+        if already_running:
+            app.logger.warning("Attempted to start bot, but it is already running.")
+            return jsonify({"message": "Bot is already running."}), 400
+
+        app.logger.info(f"Starting bot with symbols: {symbols}, historical_days: {historical_days}, timeframes: {timeframes}, initial_capital: {initial_capital}")
+        return jsonify({"message": "Bot started successfully.", "job_id": job.id}), 200
+    except Exception as e:
+        app.logger.error(f"Error starting bot: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/stop_bot', methods=['POST'])
+def stop_bot():
+    job = bot_queue.latest()
+    if job is None or not job.active:
+        app.logger.warning("Attempted to stop bot, but it is not running.")
+        return jsonify({"message": "Bot is not running."}), 400
+    
+    try:
+        # İptal sinyali canlı döngüyü bir sonraki await noktasında durdurur
+        job.cancel()
+        if not job.wait(timeout=5):
+            # İş mevcut aşamasını bitirdiğinde durur; durum /api/jobs/<id> ile izlenebilir
+            app.logger.warning("Bot job is still finishing its current stage.")
+            return jsonify({"message": "Bot stop requested; it is still finishing its current stage.",
+                            "job_id": job.id}), 202
+        app.logger.info("Bot stopped successfully.")
+        return jsonify({"message": "Bot stopped successfully."}), 200
+    except Exception as e:
+        app.logger.error(f"Error stopping bot: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/backtest', methods=['POST'])
+def backtest():
+    """
+    Run a backtest through the job queue.
+
+    With "async": true the job ID is returned at once for polling; otherwise the
+    request waits for the result as before.
+    """
+    try:
+        data = request.json
+        job, deduplicated = submit_job("backtest", data)
+        if data.get('async'):
+            return jsonify({**job.to_dict(), "deduplicated": deduplicated}), 202
+
+        job.wait()
+        if job.cancelled:
+            return jsonify({**job.to_dict(), "error": "Job was cancelled."}), 409
+        if job.error is not None:
+            raise RuntimeError(job.error)
+        return jsonify(job.result), 200
+    except QueueFull as e:
+        app.logger.warning(f"Backtest rejected: {str(e)}")
+        return jsonify({"error": str(e)}), 429
+    except Exception as e:
+        app.logger.error(f"Backtest error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/optimize', methods=['POST'])
+def optimize():
+    """
+    Run a parameter grid over one cached price series and return the ranked results.
+    """
+    try:
+        data = request.json
+        job, deduplicated = submit_job("optimize", data)
+        if data.get('async'):
+            return jsonify({**job.to_dict(), "deduplicated": deduplicated}), 202
+
+        job.wait()
+        if job.cancelled:
+            return jsonify({**job.to_dict(), "error": "Job was cancelled."}), 409
+        if job.error is not None:
+            raise RuntimeError(job.error)
+        return jsonify(job.result), 200
+    except QueueFull as e:
+        app.logger.warning(f"Optimization rejected: {str(e)}")
+        return jsonify({"error": str(e)}), 429
+    except Exception as e:
+        app.logger.error(f"Optimization error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/portfolio', methods=['POST'])
+def portfolio():
+    """
+    Backtest several symbols as one portfolio with shared capital, sizing, fees and slippage.
+
+    Trades and the equity curve are stored under the job ID for /api/get_trades and /api/get_data.
+    """
+    try:
+        data = request.json
+        job, deduplicated = submit_job("portfolio", data)
+        if data.get('async'):
+            return jsonify({**job.to_dict(), "deduplicated": deduplicated}), 202
+
+        job.wait()
+        if job.cancelled:
+            return jsonify({**job.to_dict(), "error": "Job was cancelled."}), 409
+        if job.error is not None:
+            raise RuntimeError(job.error)
+        return jsonify({**job.result, "job_id": job.id}), 200
+    except QueueFull as e:
+        app.logger.warning(f"Portfolio backtest rejected: {str(e)}")
+        return jsonify({"error": str(e)}), 429
+    except Exception as e:
+        app.logger.error(f"Portfolio backtest error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/jobs', methods=['POST'])
+def create_job():
+    """
+    Submit a backtest or optimization job and return its ID immediately.
+    """
+    try:
+        data = request.json
+        kind = data.get('kind', 'backtest')
+        if kind not in JOB_KINDS:
+            return jsonify({"error": f"Unknown job kind: {kind}"}), 400
+        job, deduplicated = submit_job(kind, data)
+        return jsonify({**job.to_dict(), "deduplicated": deduplicated}), 202
+    except QueueFull as e:
+        app.logger.warning(f"Job rejected: {str(e)}")
+        return jsonify({"error": str(e)}), 429
+    except Exception as e:
+        app.logger.error(f"Error submitting job: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/jobs', methods=['GET'])
+def list_jobs():
+    """
+    List known jobs and their status.
+    """
+    return jsonify({"jobs": backtest_queue.list() + bot_queue.list()}), 200
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """
+    Retrieve the status of one job.
+    """
+    job = find_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found."}), 404
+    return jsonify(job.to_dict()), 200
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    """
+    Retrieve a job's result: 200 when done, 202 while it is queued or running, 409 if it was cancelled.
+    """
+    job = find_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found."}), 404
+    if job.active:
+        return jsonify(job.to_dict()), 202
+    if job.cancelled:
+        return jsonify({**job.to_dict(), "error": "Job was cancelled."}), 409
+    if job.error is not None:
+        return jsonify(job.to_dict()), 500
+    return jsonify({**job.to_dict(), "result": job.result}), 200
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """
+    Cancel a job; queued jobs never start and running jobs stop at their next stage boundary.
+    """
+    job = find_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found."}), 404
+    job.cancel()
+    return jsonify(job.to_dict()), 200
+
+@app.route('/api/jobs/<job_id>/profile', methods=['GET'])
+def job_profile(job_id):
+    """
+    Retrieve the cProfile report of a job submitted with "profile": true.
+    """
+    job = find_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found."}), 404
+    if job.active:
+        return jsonify(job.to_dict()), 202
+    if 'profile' not in job.state:
+        return jsonify({"error": "Job was not profiled."}), 404
+    return Response(job.state['profile'], mimetype='text/plain'), 200
+
+def get_run_id(job_id=None):
+    """
+    Return the stored run for a job ID, defaulting to the latest bot run, or None.
+
+    IDs that are not 32 hex characters are treated as unknown without touching the disk.
+    """
+    if not job_id:
+        job = bot_queue.latest()
+        job_id = job.id if job is not None else None
+    if job_id and JOB_ID_PATTERN.fullmatch(job_id) and results_store.has_run(job_id):
+        return job_id
+    return None
+
+def parse_list_arg(name):
+    value = request.args.get(name)
+    return [item.strip() for item in value.split(',') if item.strip()] if value else None
+
+def parse_time_arg(name):
+    """
+    Read a time query argument given as epoch milliseconds or a date string, or None.
+    """
+    value = request.args.get(name)
+    if not value:
+        return None
+    return to_milliseconds(int(value) if value.isdigit() else value)
+
+def chart_trades(run_id, symbol, timeframe):
+    """
+    Return the stored trades of a run that belong to symbol and timeframe, or None.
+
+    Only a key whose recorded symbol and timeframe both match is used, so markers are
+    never drawn on another series.
+    """
+    if run_id is None:
+        return None
+    series = results_store.manifest(run_id).get("series", {})
+    for key, meta in series.items():
+        if meta == {"symbol": symbol, "timeframe": timeframe}:
+            return results_store.trades(run_id, key, columns=['Date', 'Type', 'Price'])
+    return None
+
+@app.route('/api/chart', methods=['GET'])
+def chart():
+    """
+    Retrieve a close series downsampled to ?width= pixels, with every buy/sell marker kept.
+
+    ?symbol=, ?timeframe=, ?method=lttb|minmax, optional ?start= / ?end= (epoch ms or
+    date strings) and ?job_id= for the run whose trades are drawn (default: latest bot run).
+    """
+    try:
+        symbol = request.args.get('symbol', 'ETHUSDT')
+        timeframe = request.args.get('timeframe', '5m')
+        width = max(request.args.get('width', 1000, type=int), 3)
+        method = request.args.get('method', 'lttb')
+        if method not in DOWNSAMPLE_METHODS:
+            return jsonify({"error": f"Unknown method: {method}"}), 400
+        start_ms = parse_time_arg('start')
+        end_ms = parse_time_arg('end')
+
+        # Önce yerel mum önbelleği kullanılır; yoksa borsadan indirilir
+        df = kline_store.cached(symbol, timeframe)
+        if df is None:
+            df = kline_store.get(kline_downloader, symbol, timeframe, start_ms or get_start_str(60))
+        times = df.index
+        lo = 0 if start_ms is None else times.searchsorted(pd.to_datetime(start_ms, unit='ms'))
+        hi = len(times) if end_ms is None else times.searchsorted(pd.to_datetime(end_ms, unit='ms'), side='right')
+        view = df.iloc[lo:hi]
+        if view.empty:
+            return jsonify({"error": "No bars in the requested range."}), 404
+
+        run_id = get_run_id(request.args.get('job_id'))
+        # Son çubuk anahtarda olduğundan yeni veri geldiğinde önbellek kendiliğinden yenilenir
+        key = (symbol, timeframe, start_ms, end_ms, width, method, run_id, int(view.index[-1].value))
+        payload = chart_cache.get(key)
+        if payload is None:
+            payload = chart_payload(view, chart_trades(run_id, symbol, timeframe), width, method)
+            chart_cache.put(key, payload)
+        return jsonify(payload), 200
+    except Exception as e:
+        app.logger.error(f"Error building chart: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/get_trades', methods=['GET'])
+def get_trades():
+    """
+    Stream stored trades of the latest bot run, or of the run given by ?job_id=.
+
+    Optional ?timeframe= (comma separated keys), ?columns=, ?offset= and ?limit= select
+    a slice of each trade list.
+    """
+    try:
+        run_id = get_run_id(request.args.get('job_id'))
+        if run_id is None:
+            return jsonify({"trades": {}}), 200
+        # Anahtarlar akış başlamadan doğrulanır; akış sırasında oluşan hata yanıtı yarıda keser
+        keys = parse_list_arg('timeframe')
+        unknown = [key for key in keys or [] if key not in results_store.manifest(run_id)["keys"]]
+        if unknown:
+            return jsonify({"error": f"Unknown trade keys: {unknown}"}), 404
+        chunks = results_store.iter_trades_json(
+            run_id,
+            keys=keys,
+            offset=request.args.get('offset', 0, type=int),
+            limit=request.args.get('limit', type=int),
+            columns=parse_list_arg('columns')
+        )
+        return Response(stream_with_context(chunks), mimetype='application/json'), 200
+    except Exception as e:
+        app.logger.error(f"Error retrieving trades: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/get_profit', methods=['GET'])
+def get_profit():
+    """
+    Retrieve stored profit data of the latest bot run, or of the run given by ?job_id=.
+    """
+    try:
+        run_id = get_run_id(request.args.get('job_id'))
+        if run_id is None:
+            return jsonify({"profits": []}), 200
+        manifest = results_store.manifest(run_id)
+        return jsonify({"profits": manifest["profits"], "keys": manifest["keys"]}), 200
+    except Exception as e:
+        app.logger.error(f"Error retrieving profit data: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/get_data', methods=['GET'])
+def get_data():
+    """
+    Retrieve a page of a stored indicator/signal frame: ?timeframe=, ?columns=, ?offset=, ?limit=.
+    """
+    try:
+        run_id = get_run_id(request.args.get('job_id'))
+        if run_id is None:
+            return jsonify({"error": "No stored run found."}), 404
+        frames = results_store.manifest(run_id)["frames"]
+        key = request.args.get('timeframe') or (frames[0] if frames else None)
+        if key not in frames:
+            return jsonify({"error": "Run has no stored frames." if not frames else f"Unknown frame key: {key}"}), 404
+        df = results_store.read_frame(
+            run_id, key,
+            columns=parse_list_arg('columns'),
+            offset=request.args.get('offset', 0, type=int),
+            limit=request.args.get('limit', 1000, type=int)
+        )
+        return Response(df.to_json(orient='split', date_format='iso'), mimetype='application/json'), 200
+    except Exception as e:
+        app.logger.error(f"Error retrieving data: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/bot_status', methods=['GET'])
+def bot_status_route():
+    """
+    Retrieve bot status.
+    """
+    try:
+        job = bot_queue.latest()
+        return jsonify({
+            "bot_running": job is not None and job.active,
+            "live": [trader.status() for trader in job.state.get("traders", [])] if job else []
+        }), 200
+    except Exception as e:
+        app.logger.error(f"Error retrieving bot status: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """
+    Expose pipeline stage timings and cache hit/miss counts in the Prometheus text format.
+    """
+    return Response(render_prometheus(), mimetype='text/plain; version=0.0.4'), 200
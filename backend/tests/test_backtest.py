@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import synthetic_frame
+from trading_bot import backtest_strategy
+
+
+def signal_frame(n, seed, buy_rate=0.05, sell_rate=0.05):
+    """
+    Return synthetic bars with random 0/1 Buy_Signal and Sell_Signal columns.
+    """
+    rng = np.random.default_rng(seed)
+    df = synthetic_frame(n, seed=seed, volatility=0.01)
+    df['Buy_Signal'] = (rng.random(n) < buy_rate).astype(int)
+    df['Sell_Signal'] = (rng.random(n) < sell_rate).astype(int)
+    return df
+
+
+def assert_same_backtest(df, **kwargs):
+    vectorized = backtest_strategy(df, engine='vectorized', **kwargs)
+    loop = backtest_strategy(df, engine='loop', **kwargs)
+    # Frames compare NaN prices as equal, which plain dict equality does not
+    pd.testing.assert_frame_equal(pd.DataFrame(vectorized[0]), pd.DataFrame(loop[0]))
+    np.testing.assert_equal(vectorized[1], loop[1])
+    return vectorized
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_engines_match_on_random_signals(seed):
+    rng = np.random.default_rng(1000 + seed)
+    df = signal_frame(int(rng.integers(50, 3000)), seed, rng.uniform(0.001, 0.3), rng.uniform(0.001, 0.3))
+    assert_same_backtest(df, initial_capital=5000, stop_loss_pct=rng.uniform(0.001, 0.05),
+                         take_profit_pct=rng.uniform(0.001, 0.08))
+
+
+def test_engines_match_with_nan_closes():
+    df = signal_frame(2000, seed=7, buy_rate=0.2, sell_rate=0.1)
+    rng = np.random.default_rng(7)
+    df.loc[df.index[rng.choice(len(df), 200, replace=False)], 'Close'] = np.nan
+    df.iloc[:5, df.columns.get_loc('Close')] = np.nan
+    assert_same_backtest(df)
+
+
+def test_empty_frame():
+    df = signal_frame(10, seed=1).iloc[:0]
+    trades, profit = assert_same_backtest(df)
+    assert trades == [] and profit == 0
+
+
+def test_entry_on_last_bar_closes_at_end():
+    df = signal_frame(100, seed=2, buy_rate=0, sell_rate=0)
+    df.iloc[-1, df.columns.get_loc('Buy_Signal')] = 1
+    trades, profit = assert_same_backtest(df)
+    assert [trade['Type'] for trade in trades] == ['Buy', 'Sell']
+    assert trades[1]['Reason'] == 'End' and profit == 0
+
+
+def test_single_bar_frame():
+    df = signal_frame(1, seed=3, buy_rate=1, sell_rate=1)
+    assert_same_backtest(df)
+
+
+@pytest.mark.parametrize('buy_rate, sell_rate', [(0, 0), (1, 0), (0, 1), (1, 1)])
+def test_constant_signals(buy_rate, sell_rate):
+    assert_same_backtest(signal_frame(500, seed=4, buy_rate=buy_rate, sell_rate=sell_rate))
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        backtest_strategy(signal_frame(10, seed=5), engine='gpu')
@@ -0,0 +1,97 @@
+import time
+
+import numpy as np
+import pytest
+import requests
+
+from benchmarks.fake_server import FakeBinanceServer
+from benchmarks.synthetic import DEFAULT_START_MS
+from trading_bot import KlineDownloader, WeightLimiter
+from trading_bot.klines import INTERVAL_MS
+
+SYMBOL = 'ETHUSDT'
+STEP = INTERVAL_MS['5m']
+
+
+class OverlappingDownloader(KlineDownloader):
+    """
+    Downloader whose pages each start 5 bars before the previous page ends.
+    """
+
+    def chunks(self, interval, start_ms, end_ms):
+        span = (self.page_size - 5) * STEP
+        return [(max(start - 5 * STEP, start_ms), min(start + span - 1, end_ms))
+                for start in range(start_ms, end_ms + 1, span)]
+
+
+def open_times(rows):
+    return np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+
+
+def download(server, downloader_cls=KlineDownloader, **kwargs):
+    downloader = downloader_cls(server.url, page_size=100, backoff=0.001, **kwargs)
+    try:
+        return downloader.get_historical_klines(SYMBOL, '5m', DEFAULT_START_MS, DEFAULT_START_MS + 4999 * STEP)
+    finally:
+        downloader.close()
+
+
+def test_retries_keep_pages_in_order():
+    with FakeBinanceServer.synthetic(5000, symbols=(SYMBOL,), fail_every=3) as server:
+        rows = download(server, max_workers=4)
+        np.testing.assert_array_equal(open_times(rows), server.client.open_times[(SYMBOL, '5m')])
+        # 50 pages plus the earliest-bar lookup, and every third request failed once
+        assert server.requests > 51 and server.max_concurrent <= 4
+
+
+def test_overlapping_pages_are_deduplicated():
+    with FakeBinanceServer.synthetic(5000, symbols=(SYMBOL,)) as server:
+        rows = download(server, OverlappingDownloader, max_workers=4)
+        np.testing.assert_array_equal(open_times(rows), server.client.open_times[(SYMBOL, '5m')])
+
+
+@pytest.fixture
+def same_minute():
+    """
+    Wait out the end of a minute, so the fake server's per-minute weight window cannot reset mid-test.
+    """
+    remaining = 60 - time.time() % 60
+    if remaining < 5:
+        time.sleep(remaining)
+
+
+def test_weight_limit_rejection_is_raised_after_retries(same_minute):
+    with FakeBinanceServer.synthetic(5000, symbols=(SYMBOL,), weight_limit=20) as server:
+        with pytest.raises(requests.HTTPError, match='429'):
+            download(server, max_workers=1, max_retries=0)
+        assert server.requests == 11 and server.rejected == 1
+
+
+def test_limiter_follows_weight_used_by_other_clients(same_minute):
+    with FakeBinanceServer.synthetic(5000, symbols=(SYMBOL,), weight_limit=1000) as server:
+        download(server, max_workers=4)
+        used = server.requests * server.request_weight
+        downloader = KlineDownloader(server.url, weight_limit=1000)
+        try:
+            downloader.get_klines(SYMBOL, '5m', startTime=DEFAULT_START_MS, limit=10)
+        finally:
+            downloader.close()
+        assert downloader.limiter.tokens < 1000 - used
+
+
+def test_limiter_blocks_until_refilled():
+    limiter = WeightLimiter(limit=10, period=0.5)
+    limiter.acquire(10)
+    start = time.monotonic()
+    limiter.acquire(5)
+    assert time.monotonic() - start >= 0.2
+
+
+def test_limiter_sync_and_pause():
+    limiter = WeightLimiter(limit=10, period=1.0)
+    limiter.sync(8)
+    assert limiter.tokens <= 2
+    limiter.pause(0.3)
+    start = time.monotonic()
+    limiter.acquire(1)
+    assert time.monotonic() - start >= 0.3
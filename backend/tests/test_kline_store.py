@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import DEFAULT_START_MS, FakeBinanceClient
+import trading_bot.kline_store as kline_store
+from trading_bot import KlineStore
+from trading_bot.klines import INTERVAL_MS
+
+STEP = INTERVAL_MS['5m']
+
+
+class OverlappingClient(FakeBinanceClient):
+    """
+    Fake client that also returns a few bars before the requested start, as a paging overlap would.
+    """
+
+    def get_historical_klines_generator(self, symbol, interval, start_str=None, end_str=None, limit=None, **kwargs):
+        start = start_str - 3 * STEP if start_str is not None else None
+        return super().get_historical_klines_generator(symbol, interval, start, end_str, limit)
+
+
+@pytest.fixture
+def now(monkeypatch):
+    """
+    Pin the store's clock to epoch milliseconds in now[0], mid-way through bar 1000.
+    """
+    clock = [DEFAULT_START_MS + 1000 * STEP + STEP // 2]
+    monkeypatch.setattr(kline_store, 'time', SimpleNamespace(time=lambda: clock[0] / 1000))
+    return clock
+
+
+@pytest.fixture
+def store(tmp_path):
+    return KlineStore(str(tmp_path))
+
+
+def bar_ms(i):
+    return DEFAULT_START_MS + i * STEP
+
+
+def open_times(df):
+    return df.index.to_numpy().astype('datetime64[ms]').astype(np.int64)
+
+
+def test_first_get_drops_unclosed_bars(store, now):
+    client = FakeBinanceClient.synthetic(2000)
+    df = store.get(client, 'ETHUSDT', '5m', bar_ms(500))
+    assert len(client.calls) == 1
+    # Bar 1000 is still open at `now` and later bars are in the future
+    np.testing.assert_array_equal(open_times(df), [bar_ms(i) for i in range(500, 1000)])
+
+
+def test_repeated_get_makes_no_client_call(store, now, tmp_path):
+    client = FakeBinanceClient.synthetic(2000)
+    first = store.get(client, 'ETHUSDT', '5m', bar_ms(500))
+    again = store.get(client, 'ETHUSDT', '5m', bar_ms(600))
+    assert len(client.calls) == 1
+    assert again.index[0] == first.index[100] and again.index[-1] == first.index[-1]
+
+    reopened = KlineStore(str(tmp_path)).get(client, 'ETHUSDT', '5m', bar_ms(500))
+    assert len(client.calls) == 1
+    assert reopened.equals(first)
+
+
+def test_fetches_bars_before_stored_range(store, now):
+    client = FakeBinanceClient.synthetic(2000)
+    store.get(client, 'ETHUSDT', '5m', bar_ms(500))
+    df = store.get(client, 'ETHUSDT', '5m', bar_ms(300))
+    assert client.calls[-1][2:] == (bar_ms(300), bar_ms(500) - 1)
+    assert len(client.calls) == 2
+    np.testing.assert_array_equal(open_times(df), [bar_ms(i) for i in range(300, 1000)])
+
+
+def test_fetches_new_bars_after_last_close(store, now):
+    client = FakeBinanceClient.synthetic(2000)
+    store.get(client, 'ETHUSDT', '5m', bar_ms(500))
+    now[0] += 10 * STEP
+    df = store.get(client, 'ETHUSDT', '5m', bar_ms(500))
+    assert client.calls[-1][2:] == (bar_ms(1000), None)
+    assert len(client.calls) == 2
+    np.testing.assert_array_equal(open_times(df), [bar_ms(i) for i in range(500, 1010)])
+
+
+def test_overlapping_fetches_are_deduplicated(store, now):
+    client = OverlappingClient(FakeBinanceClient.synthetic(2000).klines)
+    store.get(client, 'ETHUSDT', '5m', bar_ms(500))
+    store.get(client, 'ETHUSDT', '5m', bar_ms(300))
+    now[0] += 10 * STEP
+    df = store.get(client, 'ETHUSDT', '5m', bar_ms(297))
+    assert df.index.is_unique and df.index.is_monotonic_increasing
+    np.testing.assert_array_equal(open_times(df), [bar_ms(i) for i in range(297, 1010)])
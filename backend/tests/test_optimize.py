@@ -0,0 +1,24 @@
+import pytest
+
+from trading_bot import SIGNAL_PARAMS
+from trading_bot.optimize import expand_grid
+
+
+def test_grid_keeps_timeframe_defaults():
+    combos = expand_grid({'rsi_length': [10, 14]}, '5m')
+    assert len(combos) == 2
+    for key, value in SIGNAL_PARAMS['5m'].items():
+        assert (combos[key] == value).all()
+
+
+def test_unknown_timeframe_needs_every_signal_key():
+    grid = {key: [value] for key, value in SIGNAL_PARAMS['5m'].items()}
+    combos = expand_grid(grid, '15m')
+    assert combos.drop(columns=list(grid)).equals(expand_grid({}, '5m').drop(columns=list(grid)))
+    with pytest.raises(ValueError, match='missing'):
+        expand_grid({'rsi_threshold_buy': [30]}, '15m')
+
+
+def test_unknown_parameter():
+    with pytest.raises(ValueError, match='Unknown optimization parameters'):
+        expand_grid({'rsi_len': [10]}, '5m')
@@ -0,0 +1,50 @@
+import numpy as np
+
+from benchmarks.synthetic import DEFAULT_START_MS, synthetic_frame
+from trading_bot import backtest_portfolio
+
+
+def signal_frame(n, seed, buys=(), sells=(), **kwargs):
+    """
+    Return synthetic bars with Buy_Signal and Sell_Signal set on the given bar positions.
+    """
+    df = synthetic_frame(n, seed=seed, volatility=0.001, **kwargs)
+    df['Buy_Signal'] = 0
+    df['Sell_Signal'] = 0
+    df.iloc[list(buys), df.columns.get_loc('Buy_Signal')] = 1
+    df.iloc[list(sells), df.columns.get_loc('Sell_Signal')] = 1
+    return df
+
+
+def test_symbol_ending_early_closes_at_its_last_bar():
+    early = signal_frame(1000, seed=1, buys=[990])
+    late = signal_frame(3000, seed=2, buys=[1500], sells=[1600])
+    result = backtest_portfolio({"A": early, "B": late}, max_positions=1, stop_loss_pct=0.5, take_profit_pct=0.5)
+
+    sell = result["trades"]["A"][1]
+    assert sell["Reason"] == 'End'
+    assert sell["Date"] == early.index[-1]
+    assert np.isclose(sell["Price"], early['Close'].iloc[-1] * (1 - 0.0005))
+    # The slot and cash A held are free again once it runs out of data
+    assert [trade["Date"] for trade in result["trades"]["B"]] == [late.index[1500], late.index[1600]]
+    assert result["summary"]["skipped_signals"] == 0
+    assert np.isclose(result["equity"]["Cash"].iloc[-1], result["summary"]["final_equity"])
+
+
+def test_staggered_symbol_ranges():
+    step = 5 * 60 * 1000
+    frames = {
+        "A": signal_frame(2000, seed=3, buys=[100, 1990], sells=[500]),
+        "B": signal_frame(2000, seed=4, buys=[10, 1995], start_ms=DEFAULT_START_MS + 1000 * step),
+        "C": signal_frame(500, seed=5, buys=[400], start_ms=DEFAULT_START_MS + 700 * step)
+    }
+    result = backtest_portfolio(frames, stop_loss_pct=0.5, take_profit_pct=0.5)
+
+    assert result["summary"]["bars"] == 3000
+    for symbol, df in frames.items():
+        trades = result["trades"][symbol]
+        assert all(trade["Date"] in df.index for trade in trades)
+        ends = [trade for trade in trades if trade.get("Reason") == 'End']
+        assert [trade["Date"] for trade in ends] == [df.index[-1]]
+    assert result["trades"]["A"][1]["Reason"] == 'Signal'
+    assert np.isclose(result["equity"]["Cash"].iloc[-1], result["summary"]["final_equity"])
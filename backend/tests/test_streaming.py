@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_frame
+from trading_bot import compute_indicators, generate_signals
+from trading_bot.streaming import StreamingIndicators, evaluate_signals
+
+pytest.importorskip('pandas_ta')
+
+
+@pytest.fixture(scope='module')
+def batch():
+    df = synthetic_frame(2000, seed=11, volatility=0.01)
+    return compute_indicators(df, '5m')
+
+
+@pytest.fixture(scope='module')
+def streamed(batch):
+    indicators = StreamingIndicators()
+    rows = [indicators.update(close) for close in batch['Close'].to_numpy()]
+    return indicators.columns, {column: np.array([row[column] for row in rows]) for column in rows[0]}
+
+
+def test_streaming_indicators_match_batch(batch, streamed):
+    columns, values = streamed
+    for column in columns.values():
+        expected = batch[column].to_numpy(dtype=np.float64)
+        actual = values[column]
+        np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected), err_msg=column)
+        warm = ~np.isnan(expected)
+        np.testing.assert_allclose(actual[warm], expected[warm], rtol=1e-8, atol=1e-8, err_msg=column)
+
+
+@pytest.mark.parametrize('timeframe', ['5m', '1h'])
+def test_evaluate_signals_matches_generate_signals(batch, streamed, timeframe):
+    columns, values = streamed
+    expected = generate_signals(batch.copy(), timeframe)
+    close = batch['Close'].to_numpy()
+    signals = [evaluate_signals(close[i], {column: values[column][i] for column in values}, timeframe,
+                                columns=columns)
+               for i in range(len(close))]
+    buy, sell = (np.array(side) for side in zip(*signals))
+    np.testing.assert_array_equal(buy, expected['Buy_Signal'].to_numpy())
+    np.testing.assert_array_equal(sell, expected['Sell_Signal'].to_numpy())
+    assert buy.sum() > 0 and sell.sum() > 0
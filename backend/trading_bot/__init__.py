@@ -1,10 +1,69 @@
-from .trading_bot import (
-    get_binance_client,
-    get_historical_data,
-    compute_indicators,
-    generate_signals,
-    backtest_strategy,
-    plot_signals,
-    display_trades,
-    plot_profit_comparison
-)
+import importlib
+
+# Public name -> submodule. Submodules are imported on first attribute access so
+# that `import trading_bot` stays cheap and optional dependencies (matplotlib,
+# pandas_ta, binance, pyarrow, requests) load only when a feature needs them.
+_EXPORTS = {
+    'get_binance_client': 'trading_bot',
+    'get_historical_data': 'trading_bot',
+    'compute_indicators': 'trading_bot',
+    'generate_signals': 'trading_bot',
+    'backtest_strategy': 'trading_bot',
+    'SIGNAL_PARAMS': 'trading_bot',
+    'plot_signals': 'plotting',
+    'display_trades': 'plotting',
+    'plot_profit_comparison': 'plotting',
+    'KlineBuffer': 'klines',
+    'parse_klines': 'klines',
+    'fetch_klines': 'klines',
+    'to_milliseconds': 'klines',
+    'KlineDownloader': 'downloader',
+    'WeightLimiter': 'downloader',
+    'KlineStore': 'kline_store',
+    'run_backtest_jobs': 'parallel',
+    'optimize_strategy': 'optimize',
+    'run_optimization': 'optimize',
+    'backtest_portfolio': 'portfolio',
+    'run_portfolio': 'portfolio',
+    'walk_forward': 'robustness',
+    'monte_carlo': 'robustness',
+    'run_walk_forward': 'robustness',
+    'run_monte_carlo': 'robustness',
+    'StreamingIndicators': 'streaming',
+    'evaluate_signals': 'streaming',
+    'CancellationToken': 'jobs',
+    'LiveTrader': 'live',
+    'ReplayFeed': 'live',
+    'BinanceKlineFeed': 'live',
+    'run_live': 'live',
+    'JobQueue': 'jobs',
+    'QueueFull': 'jobs',
+    'job_key': 'jobs',
+    'ResultStore': 'results_store',
+    'LRUCache': 'cache',
+    'ArrayCache': 'cache',
+    'cached_signals': 'signal_cache',
+    'signals_key': 'signal_cache',
+    'chart_payload': 'downsample',
+    'downsample_indices': 'downsample',
+    'DOWNSAMPLE_METHODS': 'downsample',
+    'span': 'metrics',
+    'observe_stage': 'metrics',
+    'profiled': 'metrics',
+    'render_prometheus': 'metrics'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,176 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .metrics import CACHE_REQUESTS
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with hit and miss counters.
+
+    Entries are evicted when there are more than maxsize of them or, when maxbytes is
+    set, when their total sizeof(value) exceeds it. A named cache also counts its
+    lookups in the trading_bot_cache_requests_total metric.
+    """
+
+    def __init__(self, maxsize=128, maxbytes=None, sizeof=None, name=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                value = self._data[key]
+            else:
+                value = self._load(key)
+                if value is not None:
+                    self._insert(key, value)
+            hit = value is not None
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if self.name:
+            CACHE_REQUESTS.inc(cache=self.name, result='hit' if hit else 'miss')
+        return value if hit else default
+
+    def put(self, key, value):
+        with self._lock:
+            self._insert(key, value)
+
+    def _insert(self, key, value):
+        if key in self._data:
+            self.nbytes -= self._sizes.pop(key)
+        self._data[key] = value
+        self._data.move_to_end(key)
+        self._sizes[key] = self.sizeof(value) if self.sizeof else 0
+        self.nbytes += self._sizes[key]
+        while self._data and (len(self._data) > self.maxsize or
+                              (self.maxbytes is not None and self.nbytes > self.maxbytes)):
+            old_key, old_value = self._data.popitem(last=False)
+            self.nbytes -= self._sizes.pop(old_key)
+            self.evictions += 1
+            self._evict(old_key, old_value)
+
+    def _load(self, key):
+        """
+        Return a value for a key missing from memory, or None. Subclasses add a second tier here.
+        """
+        return None
+
+    def _evict(self, key, value):
+        """
+        Called with the lock held for every entry dropped from memory.
+        """
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {"entries": len(self._data), "bytes": self.nbytes, "hits": self.hits,
+                "misses": self.misses, "evictions": self.evictions}
+
+
+def arrays_nbytes(arrays):
+    """
+    Return the total size in bytes of a {name: ndarray} mapping.
+    """
+    return sum(array.nbytes for array in arrays.values())
+
+
+class ArrayCache(LRUCache):
+    """
+    LRU cache of {name: ndarray} mappings bounded by their total size in bytes.
+
+    With spill_dir set, entries evicted from memory are written there as .npz files
+    (up to spill_maxbytes, oldest files removed first) and loaded back on a later miss.
+    Keys must be safe to use as file names, e.g. hex digests.
+    """
+
+    def __init__(self, maxbytes=256 * 2**20, maxsize=1024, spill_dir=None, spill_maxbytes=2 * 2**30, name=None):
+        super().__init__(maxsize=maxsize, maxbytes=maxbytes, sizeof=arrays_nbytes, name=name)
+        self.spill_dir = spill_dir
+        self.spill_maxbytes = spill_maxbytes
+        self.spill_hits = 0
+        self._spilled = OrderedDict()
+        self.spill_nbytes = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+            # Files left by an earlier process stay usable: keys are content hashes
+            files = sorted((entry for entry in os.scandir(spill_dir) if entry.name.endswith('.npz')),
+                           key=lambda entry: entry.stat().st_mtime)
+            for entry in files:
+                self._spilled[entry.name[:-4]] = entry.stat().st_size
+                self.spill_nbytes += entry.stat().st_size
+
+    def _path(self, key):
+        return os.path.join(self.spill_dir, f"{key}.npz")
+
+    def _load(self, key):
+        if key not in self._spilled:
+            return None
+        try:
+            with np.load(self._path(key), allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+        except OSError:
+            self.spill_nbytes -= self._spilled.pop(key)
+            return None
+        self._spilled.move_to_end(key)
+        self.spill_hits += 1
+        return arrays
+
+    def _evict(self, key, value):
+        if not self.spill_dir:
+            return
+        if key in self._spilled:
+            self._spilled.move_to_end(key)
+            return
+        path = self._path(key)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            np.savez(f, **value)
+        os.replace(tmp, path)
+        self._spilled[key] = os.path.getsize(path)
+        self.spill_nbytes += self._spilled[key]
+        while self.spill_nbytes > self.spill_maxbytes and self._spilled:
+            old_key, size = self._spilled.popitem(last=False)
+            self.spill_nbytes -= size
+            try:
+                os.remove(self._path(old_key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        super().clear()
+        with self._lock:
+            for key in self._spilled:
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+            self._spilled.clear()
+            self.spill_nbytes = 0
+
+    def stats(self):
+        stats = super().stats()
+        stats.update({"spilled": len(self._spilled), "spill_bytes": self.spill_nbytes, "spill_hits": self.spill_hits})
+        return stats
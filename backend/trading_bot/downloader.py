@@ -0,0 +1,188 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .klines import INTERVAL_MS, PAGE_SIZE, to_milliseconds
+
+BINANCE_URL = 'https://api.binance.com'
+BINANCE_TESTNET_URL = 'https://testnet.binance.vision'
+KLINES_PATH = '/api/v3/klines'
+KLINES_WEIGHT = 2
+USED_WEIGHT_HEADER = 'X-MBX-USED-WEIGHT-1m'
+RETRY_STATUSES = (418, 429, 500, 502, 503, 504)
+
+
+class WeightLimiter:
+    """
+    Token bucket over Binance's per-minute request weight budget.
+
+    Tokens refill continuously at limit/period per second. After each response the
+    bucket is synced to the server's X-MBX-USED-WEIGHT-1m header, so weight spent by
+    other clients on the same IP is respected too.
+    """
+
+    def __init__(self, limit=6000, period=60.0):
+        self.limit = limit
+        self.rate = limit / period
+        self.tokens = float(limit)
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.limit, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, weight=1):
+        """
+        Block until weight tokens are available and take them.
+        """
+        with self._cond:
+            while True:
+                self._refill()
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                self._cond.wait((weight - self.tokens) / self.rate)
+
+    def sync(self, used_weight):
+        """
+        Lower the available tokens to what the server says is left of the budget.
+        """
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.tokens, float(self.limit - used_weight))
+
+    def pause(self, seconds):
+        """
+        Empty the bucket for at least the given time, e.g. after a 429 with Retry-After.
+        """
+        with self._cond:
+            self._refill()
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+class KlineDownloader:
+    """
+    Concurrent paged kline downloader over a pooled HTTP session.
+
+    A range is split into page-sized chunks that are requested by up to max_workers
+    threads. All requests share one WeightLimiter, failed requests are retried with
+    exponential backoff, and pages are yielded back in order without duplicates.
+    Implements the kline methods of binance.client.Client used by the pipeline, so it
+    can be passed wherever a client is expected.
+    """
+
+    def __init__(self, base_url=BINANCE_URL, max_workers=4, weight_limit=6000, max_retries=5,
+                 backoff=0.5, timeout=10, page_size=PAGE_SIZE, session=None):
+        self.base_url = base_url.rstrip('/')
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.page_size = page_size
+        self.limiter = WeightLimiter(weight_limit)
+        self._earliest = {}
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='klines')
+
+    @classmethod
+    def for_binance(cls, testnet=False, **kwargs):
+        return cls(BINANCE_TESTNET_URL if testnet else BINANCE_URL, **kwargs)
+
+    def _request(self, params):
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(KLINES_WEIGHT)
+            try:
+                response = self.session.get(self.base_url + KLINES_PATH, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+                continue
+
+            used = response.headers.get(USED_WEIGHT_HEADER)
+            if used is not None:
+                self.limiter.sync(int(used))
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                response.raise_for_status()
+                return response.json()
+
+            delay = self.backoff * 2 ** attempt * (1 + random.random())
+            retry_after = response.headers.get('Retry-After')
+            if retry_after is not None:
+                delay = max(delay, float(retry_after))
+                self.limiter.pause(float(retry_after))
+            time.sleep(delay)
+
+    def get_klines(self, symbol, interval, startTime=None, endTime=None, limit=500, **kwargs):
+        params = {"symbol": symbol, "interval": interval, "limit": limit}
+        if startTime is not None:
+            params["startTime"] = int(startTime)
+        if endTime is not None:
+            params["endTime"] = int(endTime)
+        return self._request(params)
+
+    def earliest_open_time(self, symbol, interval):
+        """
+        Return the open time of the first bar the exchange has for a symbol and interval.
+        """
+        key = (symbol, interval)
+        if key not in self._earliest:
+            first = self._executor.submit(self.get_klines, symbol, interval, startTime=0, limit=1).result()
+            if not first:
+                return None
+            self._earliest[key] = first[0][0]
+        return self._earliest[key]
+
+    def chunks(self, interval, start_ms, end_ms):
+        """
+        Split [start_ms, end_ms] into (start, end) ranges of at most page_size bars.
+        """
+        span = self.page_size * INTERVAL_MS[interval]
+        return [(start, min(start + span - 1, end_ms)) for start in range(start_ms, end_ms + 1, span)]
+
+    def get_historical_klines_generator(self, symbol, interval, start_str=None, end_str=None, **kwargs):
+        """
+        Yield klines from start_str to end_str (default now) in open time order.
+
+        At most 2 * max_workers pages are in flight or buffered at once.
+        """
+        end_ms = int(time.time() * 1000) if end_str is None else to_milliseconds(end_str)
+        earliest = self.earliest_open_time(symbol, interval)
+        if earliest is None:
+            return
+        start_ms = earliest if start_str is None else max(to_milliseconds(start_str), earliest)
+        chunks = iter(self.chunks(interval, start_ms, end_ms))
+
+        pending = deque()
+        for _ in range(2 * self.max_workers):
+            self._submit(pending, symbol, interval, next(chunks, None))
+        last_open = None
+        while pending:
+            rows = pending.popleft().result()
+            self._submit(pending, symbol, interval, next(chunks, None))
+            for row in rows:
+                if last_open is None or row[0] > last_open:
+                    last_open = row[0]
+                    yield row
+
+    def _submit(self, pending, symbol, interval, chunk):
+        if chunk is not None:
+            pending.append(self._executor.submit(self.get_klines, symbol, interval,
+                                                 startTime=chunk[0], endTime=chunk[1], limit=self.page_size))
+
+    def get_historical_klines(self, symbol, interval, start_str=None, end_str=None, **kwargs):
+        return list(self.get_historical_klines_generator(symbol, interval, start_str, end_str))
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
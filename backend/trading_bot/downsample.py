@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Return the indices of up to threshold points picked by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept. Each bucket keeps the point forming the
+    largest triangle with the previously kept point and the mean of the next bucket.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[stop:next_stop].mean()
+        avg_y = y[stop:next_stop].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        selected[bucket + 1] = a
+    return selected
+
+
+def minmax_indices(y, threshold):
+    """
+    Return the indices of each bucket's minimum and maximum, about threshold points in total.
+
+    Keeps every spike visible at the cost of a slightly jagged line; first and last points are kept.
+    """
+    n = len(y)
+    buckets = threshold // 2
+    if threshold >= n or buckets < 1:
+        return np.arange(n)
+    y = np.asarray(y, dtype=np.float64)
+    size = n // buckets
+    body = y[:size * buckets].reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    picks = [offsets + body.argmin(axis=1), offsets + body.argmax(axis=1), [0, n - 1]]
+    if size * buckets < n:
+        tail = y[size * buckets:]
+        picks.append([size * buckets + tail.argmin(), size * buckets + tail.argmax()])
+    return np.unique(np.concatenate(picks))
+
+
+def downsample_indices(x, y, width, method='lttb'):
+    """
+    Return sorted indices of the points to draw at a chart width of width pixels.
+    """
+    if method == 'lttb':
+        return lttb_indices(x, y, width)
+    if method == 'minmax':
+        return minmax_indices(y, width)
+    raise ValueError(f"Unknown downsampling method: {method}")
+
+
+def chart_payload(df, trades=None, width=1000, method='lttb'):
+    """
+    Build a chart-ready, downsampled close series with buy/sell markers.
+
+    df is a Date-indexed frame with a Close column. Bars that carry a trade are always
+    kept in the series, and every trade in the frame's range is returned as a marker.
+    Times are epoch milliseconds.
+    """
+    times = df.index.to_numpy().astype('datetime64[ms]').astype(np.int64)
+    close = df['Close'].to_numpy(dtype=np.float64)
+    keep = downsample_indices(times, close, width, method)
+
+    markers = {"buy": {"t": [], "price": []}, "sell": {"t": [], "price": []}}
+    if trades and len(times):
+        dates = pd.DatetimeIndex([trade['Date'] for trade in trades]).as_unit('ms').asi8
+        kinds = np.array([trade['Type'] for trade in trades])
+        prices = np.array([trade['Price'] for trade in trades], dtype=np.float64)
+        in_range = (dates >= times[0]) & (dates <= times[-1])
+        positions = np.searchsorted(times, dates[in_range])
+        keep = np.union1d(keep, positions[positions < len(times)])
+        for kind, name in (('Buy', 'buy'), ('Sell', 'sell')):
+            mask = kinds[in_range] == kind
+            markers[name] = {"t": dates[in_range][mask].tolist(), "price": prices[in_range][mask].tolist()}
+
+    return {
+        "method": method,
+        "width": width,
+        "bars": len(times),
+        "points": len(keep),
+        "t": times[keep].tolist(),
+        "close": close[keep].tolist(),
+        "markers": markers
+    }
@@ -0,0 +1,228 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .metrics import profiled
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+
+class Cancelled(Exception):
+    """
+    Raised by check_cancelled to stop a job between stages.
+    """
+
+
+def check_cancelled(token, futures=()):
+    """
+    Raise Cancelled if token (which may be None) was cancelled, cancelling futures not yet started.
+    """
+    if token is not None and token.cancelled:
+        for future in futures:
+            future.cancel()
+        raise Cancelled()
+
+
+class CancellationToken:
+    """
+    Stop signal that can be raised from any thread and awaited inside an asyncio loop.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._waiters = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        with self._lock:
+            self._event.set()
+            waiters, self._waiters = self._waiters, []
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    async def wait(self):
+        """
+        Wait until cancel() is called, without polling.
+        """
+        event = asyncio.Event()
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._waiters.append((asyncio.get_running_loop(), event))
+        await event.wait()
+
+
+class QueueFull(Exception):
+    """
+    Raised when a JobQueue already holds its maximum number of active jobs.
+    """
+
+
+def job_key(kind, params):
+    """
+    Return a stable key for a job kind and its JSON-serializable parameters, used for deduplication.
+    """
+    payload = json.dumps([kind, params], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class Job:
+    """
+    One unit of work with its own status, result, error and cancellation token.
+
+    The worker function receives the Job as its first argument. It may publish partial
+    results through job.result and keep arbitrary per-job objects in job.state.
+    """
+
+    def __init__(self, kind, key):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.key = key
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.state = {}
+        self.token = CancellationToken()
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.done = threading.Event()
+
+    @property
+    def active(self):
+        return self.status in ACTIVE_STATES
+
+    @property
+    def cancelled(self):
+        return self.status == CANCELLED
+
+    def cancel(self):
+        self.token.cancel()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+    def to_dict(self):
+        info = {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+        if self.error is not None:
+            info["error"] = self.error
+        return info
+
+
+class JobQueue:
+    """
+    Bounded worker pool that runs jobs in the background and tracks them by ID.
+
+    Submitting a job whose key matches a queued or running job returns that job instead
+    of starting a duplicate. At most max_workers jobs run at once and at most max_pending
+    more may wait; finished jobs are kept for polling until max_finished is exceeded.
+    """
+
+    def __init__(self, max_workers=2, max_pending=16, max_finished=100):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs = OrderedDict()
+        self._active_by_key = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, fn, *args, key=None, profile=False, **kwargs):
+        """
+        Queue fn(job, *args, **kwargs) and return (job, deduplicated).
+
+        With profile=True the job runs under cProfile and the report lands in job.state['profile'].
+        """
+        with self._lock:
+            if key is not None and key in self._active_by_key:
+                return self._active_by_key[key], True
+            active = sum(1 for job in self._jobs.values() if job.active)
+            if active >= self.max_workers + self.max_pending:
+                raise QueueFull(f"Job queue is full ({active} active jobs).")
+            job = Job(kind, key)
+            self._jobs[job.id] = job
+            if key is not None:
+                self._active_by_key[key] = job
+            self._evict_finished()
+        self._executor.submit(self._run, job, fn, args, kwargs, profile)
+        return job, False
+
+    def _run(self, job, fn, args, kwargs, profile=False):
+        if job.token.cancelled:
+            self._finish(job, CANCELLED)
+            return
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            with profiled(profile) as report:
+                result = fn(job, *args, **kwargs)
+            if profile:
+                job.state['profile'] = report['stats']
+            if result is not None:
+                job.result = result
+            self._finish(job, CANCELLED if job.token.cancelled and job.result is None else DONE)
+        except Cancelled:
+            self._finish(job, CANCELLED)
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, FAILED)
+
+    def _finish(self, job, status):
+        with self._lock:
+            job.status = status
+            job.finished_at = time.time()
+            if self._active_by_key.get(job.key) is job:
+                del self._active_by_key[job.key]
+        job.done.set()
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if not job.active]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def latest(self, kind=None):
+        """
+        Return the most recently submitted job, optionally of one kind.
+        """
+        with self._lock:
+            for job in reversed(self._jobs.values()):
+                if kind is None or job.kind == kind:
+                    return job
+        return None
+
+    def list(self):
+        with self._lock:
+            return [job.to_dict() for job in self._jobs.values()]
+
+    def shutdown(self, cancel=True):
+        if cancel:
+            with self._lock:
+                jobs = list(self._jobs.values())
+            for job in jobs:
+                job.cancel()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from .klines import (
+    INTERVAL_MS,
+    to_milliseconds,
+    fetch_klines,
+    ohlcv_frame
+)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'kline_cache')
+
+
+class KlineStore:
+    """
+    Persistent kline cache keyed by (symbol, interval).
+
+    Closed bars are kept in uncompressed Feather files that are memory-mapped on load.
+    Only the bars missing before the first or after the last stored bar are requested
+    from the client, and reads return views into the in-memory frame.
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR):
+        self.root = root
+        self._frames = {}
+        self._views = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, symbol, interval):
+        return os.path.join(self.root, f"{symbol}_{interval}.feather")
+
+    def _lock(self, key):
+        with self._guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _load(self, symbol, interval):
+        key = (symbol, interval)
+        if key in self._frames:
+            return self._frames[key]
+        path = self._path(symbol, interval)
+        if not os.path.exists(path):
+            return None
+        frame = feather.read_table(path, memory_map=True).to_pandas()
+        self._frames[key] = frame
+        return frame
+
+    def _save(self, symbol, interval, frame):
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        tmp_path = self._path(symbol, interval) + '.tmp'
+        feather.write_feather(table, tmp_path, compression='uncompressed')
+        os.replace(tmp_path, self._path(symbol, interval))
+        self._frames[(symbol, interval)] = frame
+        self._views.pop((symbol, interval), None)
+
+    def _fetch(self, client, symbol, interval, start_ms, end_ms=None):
+        return fetch_klines(client, symbol, interval, start_ms, end_ms)
+
+    def sync(self, client, symbol, interval, start_str):
+        """
+        Bring the stored series up to date from start_str to now and return the full frame.
+        """
+        start_ms = to_milliseconds(start_str)
+        interval_ms = INTERVAL_MS[interval]
+        with self._lock((symbol, interval)):
+            frame = self._load(symbol, interval)
+            now_ms = int(time.time() * 1000)
+            parts = []
+            if frame is None or frame.empty:
+                parts.append(self._fetch(client, symbol, interval, start_ms))
+            else:
+                first_open = int(frame["Open Time"].iloc[0])
+                last_close = int(frame["Close Time"].iloc[-1])
+                if first_open - start_ms >= interval_ms:
+                    parts.append(self._fetch(client, symbol, interval, start_ms, first_open - 1))
+                parts.append(frame)
+                if now_ms > last_close + interval_ms:
+                    parts.append(self._fetch(client, symbol, interval, last_close + 1))
+            if len(parts) == 1 and parts[0] is frame:
+                return frame
+
+            merged = pd.concat(parts, ignore_index=True)
+            merged = merged[merged["Close Time"] < now_ms]
+            merged = merged.drop_duplicates(subset="Open Time").sort_values("Open Time", ignore_index=True)
+            self._save(symbol, interval, merged)
+            return merged
+
+    def get(self, client, symbol, interval, start_str):
+        """
+        Return closed OHLCV bars from start_str to now, indexed by open Date, as in get_historical_data.
+        """
+        self.sync(client, symbol, interval, start_str)
+        with self._lock((symbol, interval)):
+            view = self.ohlcv(symbol, interval)
+        start = view.index.searchsorted(pd.to_datetime(to_milliseconds(start_str), unit="ms"))
+        return view.iloc[start:]
+
+    def cached(self, symbol, interval):
+        """
+        Return the stored OHLCV frame for a key without contacting the exchange, or None.
+        """
+        with self._lock((symbol, interval)):
+            frame = self._load(symbol, interval)
+            if frame is None or frame.empty:
+                return None
+            return self.ohlcv(symbol, interval)
+
+    def ohlcv(self, symbol, interval):
+        """
+        Return the Date-indexed OHLCV frame for a key, built once per sync and shared by all reads.
+        """
+        key = (symbol, interval)
+        view = self._views.get(key)
+        if view is None:
+            view = ohlcv_frame(self._frames[key])
+            self._views[key] = view
+        return view
+
+    def clear(self, symbol=None, interval=None):
+        """
+        Drop cached series from memory and disk, optionally only for one symbol and/or interval.
+        """
+        for name in os.listdir(self.root):
+            if not name.endswith('.feather'):
+                continue
+            file_symbol, file_interval = name[:-len('.feather')].rsplit('_', 1)
+            if symbol not in (None, file_symbol) or interval not in (None, file_interval):
+                continue
+            os.remove(os.path.join(self.root, name))
+            self._frames.pop((file_symbol, file_interval), None)
+            self._views.pop((file_symbol, file_interval), None)
@@ -0,0 +1,162 @@
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+
+from .metrics import observe_stage
+
+KLINE_COLUMNS = ["Open Time", "Open", "High", "Low", "Close", "Volume",
+                 "Close Time", "Quote Asset Volume", "Number of Trades",
+                 "Taker Buy Base Asset Volume", "Taker Buy Quote Asset Volume", "Ignore"]
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+INT_COLUMNS = ("Open Time", "Close Time", "Number of Trades")
+
+# Every kline field except the trailing "Ignore", with the dtype it is parsed into
+KLINE_DTYPES = {name: np.int64 if name in INT_COLUMNS else np.float64 for name in KLINE_COLUMNS[:-1]}
+PARSED_FIELDS = len(KLINE_DTYPES)
+
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '8h': 28_800_000, '12h': 43_200_000, '1d': 86_400_000, '3d': 259_200_000,
+    '1w': 604_800_000,
+}
+
+PAGE_SIZE = 1000
+
+
+def to_milliseconds(value):
+    """
+    Convert a start/end value (ms int, datetime or date string, UTC assumed) to epoch milliseconds.
+    """
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize('UTC')
+    return int(ts.value // 1_000_000)
+
+
+def expected_bars(interval, start_ms, end_ms=None):
+    """
+    Return how many bars of an interval fit between two timestamps (end defaults to now).
+    """
+    end_ms = int(time.time() * 1000) if end_ms is None else end_ms
+    return max(0, (end_ms - start_ms) // INTERVAL_MS[interval] + 1)
+
+
+class KlineBuffer:
+    """
+    Preallocated typed columns that raw kline pages are parsed into as they arrive.
+
+    Each page is parsed in one pass over its strings into a float64 block and copied
+    into the int64/float64 columns, so no object columns are built and only one raw
+    page needs to be alive at a time. Columns grow by doubling if the capacity is
+    exceeded.
+    """
+
+    def __init__(self, capacity=PAGE_SIZE):
+        self.size = 0
+        self.columns = {name: np.empty(max(capacity, 1), dtype=dtype) for name, dtype in KLINE_DTYPES.items()}
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def capacity(self):
+        return len(self.columns["Open Time"])
+
+    def _reserve(self, n):
+        if self.size + n <= self.capacity:
+            return
+        capacity = max(self.size + n, 2 * self.capacity)
+        for name, column in self.columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+
+    def extend(self, page):
+        """
+        Parse a list of raw kline rows (numbers as strings or numbers) and append them.
+        """
+        n = len(page)
+        if n == 0:
+            return
+        values = np.fromiter(
+            itertools.chain.from_iterable(row[:PARSED_FIELDS] for row in page),
+            dtype=np.float64, count=n * PARSED_FIELDS
+        ).reshape(n, PARSED_FIELDS)
+        self._reserve(n)
+        stop = self.size + n
+        for pos, column in enumerate(self.columns.values()):
+            # Timestamps and trade counts are below 2**53, so the float64 pass is exact
+            column[self.size:stop] = values[:, pos]
+        self.size = stop
+
+    def frame(self):
+        """
+        Return the parsed bars as a DataFrame with one typed column per kline field.
+
+        Columns are shared with the buffer; spare capacity is released first.
+        """
+        if self.size < self.capacity:
+            for name in self.columns:
+                self.columns[name] = self.columns[name][:self.size].copy()
+        return pd.DataFrame(self.columns, copy=False)
+
+
+def parse_klines(bars):
+    """
+    Convert raw Binance kline rows into a typed DataFrame with one column per kline field.
+    """
+    buffer = KlineBuffer(len(bars))
+    buffer.extend(bars)
+    return buffer.frame()
+
+
+def iter_kline_pages(client, symbol, interval, start_ms, end_ms=None, page_size=PAGE_SIZE):
+    """
+    Yield raw kline rows from the client in pages of at most page_size rows.
+
+    Uses the client's paging generator when it has one, so long ranges never sit in
+    memory as a single list of strings; otherwise falls back to one bulk request.
+    """
+    generator = getattr(client, 'get_historical_klines_generator', None)
+    if generator is None:
+        yield client.get_historical_klines(symbol=symbol, interval=interval,
+                                           start_str=start_ms, end_str=end_ms)
+        return
+    rows = generator(symbol=symbol, interval=interval, start_str=start_ms, end_str=end_ms)
+    while True:
+        page = list(itertools.islice(rows, page_size))
+        if not page:
+            return
+        yield page
+
+
+def fetch_klines(client, symbol, interval, start_ms, end_ms=None):
+    """
+    Download klines page by page, parsing each page as it arrives, and return the typed frame.
+
+    Download and parse time are recorded separately as the kline_fetch and parse stages.
+    """
+    buffer = KlineBuffer(expected_bars(interval, start_ms, end_ms))
+    parse_seconds = 0.0
+    start = time.perf_counter()
+    for page in iter_kline_pages(client, symbol, interval, start_ms, end_ms):
+        parse_start = time.perf_counter()
+        buffer.extend(page)
+        parse_seconds += time.perf_counter() - parse_start
+    observe_stage('kline_fetch', time.perf_counter() - start - parse_seconds)
+    observe_stage('parse', parse_seconds, bars=len(buffer))
+    return buffer.frame()
+
+
+def ohlcv_frame(frame):
+    """
+    Return the Date-indexed float64 OHLCV frame used by the indicator and backtest code.
+    """
+    values = np.ascontiguousarray(frame[OHLCV_COLUMNS].to_numpy(dtype=np.float64))
+    index = pd.Index(pd.to_datetime(frame["Open Time"].to_numpy(), unit="ms"), name="Date")
+    return pd.DataFrame(values, index=index, columns=OHLCV_COLUMNS)
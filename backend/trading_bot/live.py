@@ -0,0 +1,218 @@
+import asyncio
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from .streaming import StreamingIndicators, apply_signal_rules
+from .trading_bot import get_signal_params
+
+
+class LatencyStats:
+    """
+    Rolling latency samples in milliseconds.
+    """
+
+    def __init__(self, size=1000):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+
+    def add(self, value_ms):
+        self.samples.append(value_ms)
+        self.count += 1
+
+    def summary(self):
+        if not self.samples:
+            return {"count": 0}
+        values = np.fromiter(self.samples, dtype=np.float64)
+        return {
+            "count": self.count,
+            "last": float(values[-1]),
+            "mean": float(values.mean()),
+            "p50": float(np.percentile(values, 50)),
+            "p99": float(np.percentile(values, 99)),
+            "max": float(values.max())
+        }
+
+
+class ReplayFeed:
+    """
+    Replays closed bars from a DataFrame with a Close column, optionally pacing them.
+    """
+
+    def __init__(self, df, delay=0.0):
+        self.df = df
+        self.delay = delay
+
+    async def __aiter__(self):
+        open_times = self.df.index.to_numpy().astype('datetime64[ms]').astype(np.int64)
+        for open_time, close in zip(open_times, self.df['Close'].to_numpy(dtype=np.float64)):
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            yield {"open_time": int(open_time), "close_time": None, "close": close,
+                   "received": time.perf_counter()}
+
+
+class BinanceKlineFeed:
+    """
+    Closed klines from the Binance websocket kline stream.
+    """
+
+    def __init__(self, symbol, interval, testnet=False):
+        self.symbol = symbol
+        self.interval = interval
+        self.testnet = testnet
+
+    async def __aiter__(self):
+        from binance import AsyncClient, BinanceSocketManager
+
+        client = await AsyncClient.create(testnet=self.testnet)
+        try:
+            socket = BinanceSocketManager(client).kline_socket(self.symbol, interval=self.interval)
+            async with socket as stream:
+                while True:
+                    msg = await stream.recv()
+                    if msg.get('e') == 'error':
+                        raise RuntimeError(f"Kline stream error: {msg.get('m')}")
+                    kline = msg['k']
+                    if not kline['x']:
+                        continue
+                    yield {"open_time": kline['t'], "close_time": kline['T'], "close": float(kline['c']),
+                           "received": time.perf_counter()}
+        finally:
+            await client.close_connection()
+
+
+class LiveTrader:
+    """
+    Event loop that turns closed bars into signals and position changes.
+
+    Indicators and signals are updated incrementally per bar and the entry/exit rules
+    are the ones backtest_strategy applies. Fills are recorded as paper trades and
+    passed to order_handler, if given, for execution.
+    """
+
+    def __init__(self, symbol, timeframe, feed, initial_capital=10000, stop_loss_pct=0.02,
+                 take_profit_pct=0.04, params=None, order_handler=None):
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.feed = feed
+        self.initial_capital = initial_capital
+        self.capital = initial_capital
+        self.stop_loss_pct = stop_loss_pct
+        self.take_profit_pct = take_profit_pct
+        self.params = params
+        self.signal_params = get_signal_params(timeframe, params)
+        self.order_handler = order_handler
+        self.indicators = StreamingIndicators()
+        self.position = 0
+        self.buy_price = 0
+        self.trades = []
+        self.last_open_time = None
+        self.running = False
+        self.processing_latency = LatencyStats()
+        self.close_latency = LatencyStats()
+
+    def seed(self, df):
+        """
+        Warm the indicators up from historical closed bars.
+        """
+        self.indicators.seed(df['Close'].to_numpy(dtype=np.float64))
+        if len(df):
+            self.last_open_time = int(df.index[-1:].to_numpy().astype('datetime64[ms]').astype(np.int64)[0])
+
+    def _fill(self, trade):
+        self.trades.append(trade)
+        if self.order_handler is not None:
+            self.order_handler(self.symbol, trade)
+
+    def on_bar(self, bar):
+        """
+        Process one closed bar and return the trade it triggered, if any.
+        """
+        if self.last_open_time is not None and bar["open_time"] <= self.last_open_time:
+            return None
+        self.last_open_time = bar["open_time"]
+
+        close = bar["close"]
+        values = self.indicators.update(close)
+        buy, sell = apply_signal_rules(close, values, self.signal_params, self.indicators.columns)
+        date = pd.Timestamp(bar["open_time"], unit='ms')
+
+        trade = None
+        if buy == 1 and self.position == 0:
+            self.buy_price = close
+            self.position = 1
+            trade = {'Type': 'Buy', 'Price': close, 'Date': date}
+        elif self.position == 1:
+            reason = None
+            if close >= self.buy_price * (1 + self.take_profit_pct):
+                reason = 'Take-Profit'
+            elif close <= self.buy_price * (1 - self.stop_loss_pct):
+                reason = 'Stop-Loss'
+            elif sell == 1:
+                reason = 'Signal'
+            if reason is not None:
+                profit = close - self.buy_price
+                self.capital += profit
+                self.position = 0
+                trade = {'Type': 'Sell', 'Price': close, 'Date': date, 'Profit': profit, 'Reason': reason}
+
+        self.processing_latency.add((time.perf_counter() - bar["received"]) * 1000)
+        if bar.get("close_time") is not None:
+            self.close_latency.add(time.time() * 1000 - bar["close_time"])
+        if trade is not None:
+            self._fill(trade)
+        return trade
+
+    async def run(self, token):
+        """
+        Consume the feed until it ends or the token is cancelled.
+        """
+        self.running = True
+        bars = self.feed.__aiter__()
+        cancelled = asyncio.ensure_future(token.wait())
+        try:
+            while not token.cancelled:
+                next_bar = asyncio.ensure_future(bars.__anext__())
+                done, _ = await asyncio.wait({next_bar, cancelled}, return_when=asyncio.FIRST_COMPLETED)
+                if next_bar not in done:
+                    next_bar.cancel()
+                    await asyncio.gather(next_bar, return_exceptions=True)
+                    break
+                try:
+                    bar = next_bar.result()
+                except StopAsyncIteration:
+                    break
+                self.on_bar(bar)
+        finally:
+            cancelled.cancel()
+            await bars.aclose()
+            self.running = False
+
+    def status(self):
+        return {
+            "symbol": self.symbol,
+            "timeframe": self.timeframe,
+            "running": self.running,
+            "position": self.position,
+            "capital": self.capital,
+            "profit": self.capital - self.initial_capital,
+            "trades": len(self.trades),
+            "bars": self.indicators.bars,
+            "latency_ms": {
+                "processing": self.processing_latency.summary(),
+                "bar_close_to_signal": self.close_latency.summary()
+            }
+        }
+
+
+def run_live(traders, token):
+    """
+    Run several LiveTraders on one asyncio loop in the calling thread until cancelled.
+    """
+    async def main():
+        await asyncio.gather(*(trader.run(token) for trader in traders))
+
+    asyncio.run(main())
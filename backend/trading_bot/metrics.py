@@ -0,0 +1,148 @@
+import bisect
+import cProfile
+import io
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels) + '}'
+
+
+class Histogram:
+    """
+    Cumulative histogram of observations, rendered in Prometheus text format.
+    """
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            series["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float('inf'),), series["counts"]):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(bound)
+                    lines.append(f"{self.name}_bucket{_format_labels(key + (('le', le),))} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+class Counter:
+    """
+    Monotonic counter with optional labels, rendered in Prometheus text format.
+    """
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+STAGE_SECONDS = Histogram('trading_bot_stage_seconds', 'Wall time of pipeline stages in seconds.')
+STAGE_BARS = Counter('trading_bot_stage_bars_total', 'Bars processed by pipeline stages.')
+CACHE_REQUESTS = Counter('trading_bot_cache_requests_total', 'Cache lookups by cache and result (hit or miss).')
+METRICS = [STAGE_SECONDS, STAGE_BARS, CACHE_REQUESTS]
+
+
+def observe_stage(stage, seconds, bars=None):
+    """
+    Record a stage duration measured elsewhere, e.g. in a process pool worker.
+    """
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    if bars is not None:
+        STAGE_BARS.inc(bars, stage=stage)
+
+
+@contextmanager
+def span(stage):
+    """
+    Time the enclosed block and record it in the stage histogram.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+
+
+def render_prometheus():
+    """
+    Return every registered metric in the Prometheus text exposition format.
+    """
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+# cProfile hooks are process-wide on Python 3.12+, so only one block is profiled at a time
+_profiler_lock = threading.Lock()
+PROFILER_BUSY = "profiler busy: another job was being profiled, so this one ran unprofiled"
+
+
+@contextmanager
+def profiled(enabled=True, sort='cumulative', limit=40):
+    """
+    Run the enclosed block under cProfile when enabled.
+
+    Yields a dict whose 'stats' key holds the formatted top entries after the block exits.
+    If another block is already being profiled, the block runs unprofiled and 'stats'
+    holds PROFILER_BUSY.
+    """
+    report = {}
+    if not enabled:
+        yield report
+        return
+    if not _profiler_lock.acquire(blocking=False):
+        report['stats'] = PROFILER_BUSY
+        yield report
+        return
+    try:
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield report
+        finally:
+            profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+            report['stats'] = out.getvalue()
+    finally:
+        _profiler_lock.release()
@@ -0,0 +1,193 @@
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+
+from .jobs import check_cancelled
+from .trading_bot import SIGNAL_KEYS, SIGNAL_PARAMS, get_historical_data, simulate_trades
+
+INDICATOR_PARAMS = {
+    'bb_length': 20,
+    'bb_std': 2,
+    'rsi_length': 14,
+    'macd_fast': 12,
+    'macd_slow': 26,
+    'macd_signal': 9
+}
+EXIT_PARAMS = {
+    'stop_loss_pct': 0.02,
+    'take_profit_pct': 0.04
+}
+
+# Upper bound on rows x bars held in one batch of 2-D signal masks
+CHUNK_CELLS = 4_000_000
+
+
+def expand_grid(grid, timeframe):
+    """
+    Expand a {param: [values]} grid into a DataFrame with one row per combination.
+
+    Parameters missing from the grid keep the timeframe's defaults. A timeframe missing
+    from SIGNAL_PARAMS needs the grid to set every key in SIGNAL_KEYS, as in generate_signals.
+    """
+    signal_defaults = SIGNAL_PARAMS.get(timeframe, {})
+    defaults = dict(INDICATOR_PARAMS)
+    defaults.update({key: signal_defaults.get(key) for key in SIGNAL_KEYS})
+    defaults.update(EXIT_PARAMS)
+    unknown = set(grid) - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown optimization parameters: {sorted(unknown)}")
+    missing = [key for key in SIGNAL_KEYS if key not in signal_defaults and key not in grid]
+    if missing:
+        raise ValueError(f"No signal parameters defined for timeframe: {timeframe} (missing {missing})")
+
+    keys = list(defaults)
+    values = []
+    for key in keys:
+        value = grid.get(key, [defaults[key]])
+        values.append(list(value) if isinstance(value, (list, tuple, np.ndarray)) else [value])
+    return pd.DataFrame(list(itertools.product(*values)), columns=keys)
+
+
+def indicator_arrays(close, bb_length=20, bb_std=2, rsi_length=14, macd_fast=12, macd_slow=26, macd_signal=9):
+    """
+    Compute the Bollinger, RSI and MACD arrays used by the signal rules for one parameter set.
+    """
+    import pandas_ta as ta
+
+    bollinger = ta.bbands(close, length=bb_length, std=bb_std)
+    rsi = ta.rsi(close, length=rsi_length)
+    macd = ta.macd(close, fast=macd_fast, slow=macd_slow, signal=macd_signal)
+    empty = np.full(len(close), np.nan)
+    return {
+        'lower': bollinger.iloc[:, 0].to_numpy(np.float64) if bollinger is not None else empty,
+        'upper': bollinger.iloc[:, 2].to_numpy(np.float64) if bollinger is not None else empty,
+        'rsi': rsi.to_numpy(np.float64) if rsi is not None else empty,
+        'macd': macd.iloc[:, 0].to_numpy(np.float64) if macd is not None else empty,
+        'macd_signal': macd.iloc[:, 2].to_numpy(np.float64) if macd is not None else empty
+    }
+
+
+def signal_masks(close, indicators, signal_params):
+    """
+    Build 2-D buy and sell masks with one row per signal parameter combination.
+
+    signal_params is a DataFrame with the SIGNAL_KEYS columns. The arithmetic mirrors
+    generate_signals so each row matches what it would produce for those thresholds.
+    """
+    lower = indicators['lower']
+    upper = indicators['upper']
+    rsi = indicators['rsi']
+    width = upper - lower
+    proximity = signal_params['bb_proximity'].to_numpy(np.float64)[:, None]
+    rsi_buy = signal_params['rsi_threshold_buy'].to_numpy(np.float64)[:, None]
+    rsi_sell = signal_params['rsi_threshold_sell'].to_numpy(np.float64)[:, None]
+    macd_buy = signal_params['macd_condition_buy'].to_numpy(bool)[:, None]
+    macd_sell = signal_params['macd_condition_sell'].to_numpy(bool)[:, None]
+
+    buy = (
+        (close <= lower + width * proximity) &
+        (rsi < rsi_buy) &
+        (~macd_buy | (indicators['macd'] > indicators['macd_signal']))
+    )
+    sell = (
+        (close >= upper - width * proximity) &
+        (rsi > rsi_sell) &
+        (~macd_sell | (indicators['macd'] < indicators['macd_signal']))
+    )
+    return buy, sell
+
+
+def _next_true_rows(mask):
+    """
+    Row-wise version of the next-True index lookup used by simulate_trades.
+    """
+    n = mask.shape[1]
+    idx = np.where(mask, np.arange(n), n)
+    return np.minimum.accumulate(idx[:, ::-1], axis=1)[:, ::-1]
+
+
+def trade_metrics(close, trades, initial_capital=10000):
+    """
+    Summarize (entry, exit, reason) tuples into profit, trade count, win rate and max drawdown.
+    """
+    if not trades:
+        return {'total_profit': 0.0, 'trades': 0, 'win_rate': 0.0, 'max_drawdown': 0.0}
+    entries, exits, _ = zip(*trades)
+    profits = close[list(exits)] - close[list(entries)]
+    # Sequential accumulation from initial_capital, as backtest_strategy does
+    equity = np.add.accumulate(np.concatenate(([initial_capital], profits)))
+    drawdown = np.maximum.accumulate(equity) - equity
+    return {
+        'total_profit': float(equity[-1] - initial_capital),
+        'trades': len(profits),
+        'win_rate': float((profits > 0).mean()),
+        'max_drawdown': float(drawdown.max())
+    }
+
+
+def optimize_strategy(df, timeframe, grid, initial_capital=10000, top=None, max_combinations=100_000, token=None):
+    """
+    Run a grid of indicator, signal and exit parameters over one price series.
+
+    Indicators are computed once per distinct indicator parameter set, signal masks are
+    built as 2-D arrays in batches, and every exit combination reuses the same masks.
+    Returns a DataFrame of parameters and metrics ranked by total profit.
+    """
+    combos = expand_grid(grid, timeframe)
+    if len(combos) > max_combinations:
+        raise ValueError(f"Grid has {len(combos)} combinations, limit is {max_combinations}.")
+
+    close_series = df['Close'].astype(np.float64)
+    close = close_series.to_numpy()
+    n = len(close)
+    indicator_keys = list(INDICATOR_PARAMS)
+    exit_keys = list(EXIT_PARAMS)
+    rows = []
+
+    for indicator_values, group in combos.groupby(indicator_keys, sort=False):
+        indicators = indicator_arrays(close_series, **dict(zip(indicator_keys, indicator_values)))
+        signal_groups = list(group.groupby(list(SIGNAL_KEYS), sort=False))
+        chunk = max(1, CHUNK_CELLS // max(n, 1))
+
+        for start in range(0, len(signal_groups), chunk):
+            check_cancelled(token)
+            batch = signal_groups[start:start + chunk]
+            signal_params = pd.DataFrame([values for values, _ in batch], columns=list(SIGNAL_KEYS))
+            buy, sell = signal_masks(close, indicators, signal_params)
+            next_buy = _next_true_rows(buy)
+            next_sell = _next_true_rows(sell)
+
+            for row, (signal_values, exits) in enumerate(batch):
+                for stop_loss_pct, take_profit_pct in exits[exit_keys].drop_duplicates().itertuples(index=False):
+                    trades = simulate_trades(close, None, None, stop_loss_pct, take_profit_pct,
+                                             next_buy=next_buy[row], next_sell=next_sell[row])
+                    result = dict(zip(indicator_keys, indicator_values))
+                    result.update(zip(SIGNAL_KEYS, signal_values))
+                    result['stop_loss_pct'] = stop_loss_pct
+                    result['take_profit_pct'] = take_profit_pct
+                    result.update(trade_metrics(close, trades, initial_capital))
+                    rows.append(result)
+
+    ranked = pd.DataFrame(rows).sort_values('total_profit', ascending=False, kind='stable')
+    ranked = ranked.reset_index(drop=True)
+    return ranked.head(top) if top else ranked
+
+
+def run_optimization(client, symbol, timeframe, start_str, grid, initial_capital=10000, top=20, store=None,
+                     token=None):
+    """
+    Fetch one price series (through the kline store when given) and optimize over it.
+    """
+    started = time.perf_counter()
+    df = get_historical_data(client, symbol, timeframe, start_str, store=store)
+    ranked = optimize_strategy(df, timeframe, grid, initial_capital=initial_capital, top=top, token=token)
+    return {
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "bars": len(df),
+        "combinations": len(expand_grid(grid, timeframe)),
+        "elapsed": time.perf_counter() - started,
+        "results": ranked.to_dict(orient='records')
+    }
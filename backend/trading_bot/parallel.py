@@ -0,0 +1,171 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .jobs import check_cancelled
+from .metrics import observe_stage
+from .trading_bot import (
+    get_historical_data,
+    compute_indicators,
+    generate_signals,
+    backtest_strategy
+)
+from .signal_cache import added_arrays, signals_key, with_signals
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def get_process_pool(max_workers=None):
+    """
+    Return the shared process pool used for CPU-bound stages, creating it on first use.
+
+    Workers are started with the 'spawn' method so they never inherit locks held by the
+    Flask and fetch threads of the parent.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=max_workers or os.cpu_count(),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return _process_pool
+
+
+def shutdown_process_pool():
+    """
+    Shut down the shared process pool, if one was started.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown()
+            _process_pool = None
+
+
+def share_array(array):
+    """
+    Copy an array into a new shared memory block.
+
+    Returns (shm, descriptor). The descriptor is a small picklable tuple that workers pass
+    to attached_array; the caller must close and unlink shm once the workers are done.
+    """
+    array = np.ascontiguousarray(array)
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+@contextmanager
+def attached_array(descriptor):
+    """
+    Attach to an array shared by share_array and yield a read-only view of it, without copying.
+    """
+    name, shape, dtype = descriptor
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        view = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        view.flags.writeable = False
+        yield view
+        del view
+    finally:
+        shm.close()
+
+
+def compute_job(df, timeframe, initial_capital, return_frame=False, signals=None, return_signals=False):
+    """
+    Run the indicator, signal and backtest stages on one fetched DataFrame.
+
+    When signals holds cached indicator and signal arrays for df, only the backtest runs.
+    Returns a dict with trades, profit, per-stage timing in seconds and, if requested, the
+    DataFrame with indicators and signals and the freshly computed signal arrays.
+    """
+    timing = {'indicators': 0.0, 'signals': 0.0}
+    source = df
+    if signals is not None:
+        df = with_signals(df, signals)
+    else:
+        start = time.perf_counter()
+        df = compute_indicators(df, timeframe)
+        timing['indicators'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        df = generate_signals(df, timeframe)
+        timing['signals'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    trades, profit = backtest_strategy(df, initial_capital=initial_capital)
+    timing['backtest'] = time.perf_counter() - start
+
+    result = {"trades": trades, "profit": profit, "timing": timing, "bars": len(df), "cached": signals is not None}
+    if return_frame:
+        result["frame"] = df
+    if return_signals and signals is None:
+        result["signals"] = added_arrays(source, df)
+    return result
+
+
+def run_backtest_jobs(client, symbols, timeframes, start_str, initial_capital, store=None,
+                      fetch_workers=8, compute_workers=None, return_frames=False, cache=None, token=None):
+    """
+    Fetch, compute and backtest every (symbol, timeframe) pair concurrently.
+
+    Klines are fetched on a thread pool; as each fetch finishes its CPU-bound stages are
+    submitted to the shared process pool (or run inline when compute_workers is 0).
+    With a signal cache (an ArrayCache), pairs whose prices and parameters were seen
+    before skip the indicator and signal stages and are backtested inline.
+    Returns {symbol: {timeframe: result}} in input order, where each result holds trades,
+    profit and timing in seconds (fetch, indicators, signals, backtest and their total).
+    """
+    jobs = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+    if not jobs:
+        return {}
+    pool = get_process_pool(compute_workers) if compute_workers != 0 else None
+
+    def fetch(job):
+        start = time.perf_counter()
+        df = get_historical_data(client, job[0], job[1], start_str, store=store)
+        return df, time.perf_counter() - start
+
+    fetch_times = {}
+    keys = {}
+    computed = {}
+    with ThreadPoolExecutor(max_workers=min(fetch_workers, len(jobs))) as fetcher:
+        fetch_futures = {fetcher.submit(fetch, job): job for job in jobs}
+        for future in as_completed(fetch_futures):
+            check_cancelled(token, list(fetch_futures) + [f for f in computed.values() if not isinstance(f, dict)])
+            job = fetch_futures[future]
+            df, fetch_times[job] = future.result()
+            signals = None
+            if cache is not None:
+                keys[job] = signals_key(df, job[1])
+                signals = cache.get(keys[job])
+            args = (df, job[1], initial_capital, return_frames, signals, cache is not None)
+            if pool is None or signals is not None:
+                computed[job] = compute_job(*args)
+            else:
+                computed[job] = pool.submit(compute_job, *args)
+
+    results = {}
+    for job in jobs:
+        check_cancelled(token, [f for f in computed.values() if not isinstance(f, dict)])
+        symbol, timeframe = job
+        result = computed[job] if isinstance(computed[job], dict) else computed[job].result()
+        if "signals" in result:
+            cache.put(keys[job], result.pop("signals"))
+        timing = result["timing"]
+        # Stages may have run in a worker process, so they are recorded here in the parent
+        stages = ('backtest',) if result["cached"] else ('indicators', 'signals', 'backtest')
+        for stage in stages:
+            observe_stage(stage, timing[stage], bars=result["bars"])
+        timing["fetch"] = fetch_times[job]
+        timing["total"] = sum(timing.values())
+        results.setdefault(symbol, {})[timeframe] = result
+    return results
@@ -0,0 +1,72 @@
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from tabulate import tabulate
+
+
+def plot_signals(df, trades, timeframe):
+    """
+    Plot buy and sell signals along with technical indicators.
+    """
+    plt.figure(figsize=(14,7))
+    
+    # Price and Bollinger Bands
+    plt.plot(df['Close'], label='Close Price', color='black')
+    plt.plot(df['BBU_20_2.0'], label='Upper Bollinger Band', color='blue', linestyle='--')
+    plt.plot(df['BBL_20_2.0'], label='Lower Bollinger Band', color='blue', linestyle='--')
+       
+    # Buy signals
+    buys = df[df['Buy_Signal'] == 1]
+    plt.scatter(buys.index, buys['Close'], marker='^', color='green', label='Buy Signal', s=100)
+    
+    # Sell signals
+    sells = df[df['Sell_Signal'] == 1]
+    plt.scatter(sells.index, sells['Close'], marker='v', color='red', label='Sell Signal', s=100)
+    
+    # RSI graph
+    ax1 = plt.gca()
+    ax2 = ax1.twinx()
+    ax2.plot(df['RSI'], label='RSI', color='orange', alpha=0.3)
+    ax2.axhline(30, color='green', linestyle='--', alpha=0.5)
+    ax2.axhline(70, color='red', linestyle='--', alpha=0.5)
+    ax2.set_ylabel('RSI')
+    
+    # MACD graph
+    ax3 = ax1.twinx()
+    ax3.spines['right'].set_position(('outward', 60))  # Shift MACD axis to the right
+    ax3.plot(df['MACD_12_26_9'], label='MACD', color='magenta', alpha=0.3)
+    ax3.plot(df['MACDs_12_26_9'], label='Signal Line', color='cyan', alpha=0.3)
+    ax3.fill_between(df.index, df['MACDh_12_26_9'], color='grey', alpha=0.1, label='MACD Histogram')
+    ax3.set_ylabel('MACD')
+    
+    plt.title(f'ETHUSDT Buy/Sell Signals and Technical Indicators ({timeframe})')
+    plt.xlabel('Date')
+    plt.ylabel('Price (USDT)')
+    plt.legend(loc='upper left')
+    plt.grid()
+    plt.show()
+
+def display_trades(trades, timeframe):
+    """
+    Display trades in a tabular format.
+    """
+    df_trades = pd.DataFrame(trades)
+    if 'Profit' not in df_trades.columns:
+        df_trades['Profit'] = np.nan
+    print(f"\n Transactions in {timeframe} Time Zone::")
+    print(tabulate(df_trades, headers='keys', tablefmt='psql', showindex=False))
+
+def plot_profit_comparison(profits, labels=['5m', '1h']):
+    """
+    Plot a bar chart comparing profits/losses for different timeframes.
+    """
+    plt.figure(figsize=(8,6))
+    bars = plt.bar(labels, profits, color=['green' if p > 0 else 'red' for p in profits])
+    plt.title('Strategy Profit/Loss Comparison')
+    plt.xlabel('Time Zone')
+    plt.ylabel('Profit/Loss (USDT)')
+    plt.axhline(0, color='black', linewidth=0.8)
+    for bar in bars:
+        height = bar.get_height()
+        plt.text(bar.get_x() + bar.get_width()/2.0, height, f'{height:.2f}', ha='center', va='bottom')
+    plt.show()
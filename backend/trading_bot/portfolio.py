@@ -0,0 +1,251 @@
+import heapq
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .jobs import check_cancelled
+from .metrics import observe_stage
+from .parallel import get_process_pool
+from .signal_cache import added_arrays, signals_key, with_signals
+from .trading_bot import compute_indicators, generate_signals, get_historical_data, trade_exit
+
+POSITION_DTYPE = np.dtype([
+    ('symbol', 'i4'),
+    ('entry', 'i8'),
+    ('exit', 'i8'),
+    ('reason', 'U11'),
+    ('quantity', 'f8'),
+    ('entry_price', 'f8'),
+    ('exit_price', 'f8'),
+    ('cost', 'f8'),
+    ('proceeds', 'f8')
+])
+
+
+SIGNAL_COLUMNS = ['Close', 'Buy_Signal', 'Sell_Signal']
+
+
+def timed_signal_arrays(df, timeframe):
+    """
+    Like signal_arrays, but return (arrays, timing) with the indicator and signal stages
+    timed separately in seconds, for work done in a pool worker.
+    """
+    timing = {}
+    start = time.perf_counter()
+    frame = compute_indicators(df, timeframe)
+    timing['indicators'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    frame = generate_signals(frame, timeframe)
+    timing['signals'] = time.perf_counter() - start
+    return added_arrays(df, frame), timing
+
+
+def align_frames(frames):
+    """
+    Align per-symbol signal frames on the union of their timestamps.
+
+    Returns (index, close, buy, sell, last) with 2-D arrays of shape (bars, symbols) and
+    last holding the row of each symbol's final bar. Close is forward-filled over missing
+    bars and 0 before a symbol's first bar; signals are False wherever a symbol has no
+    bar of its own.
+    """
+    index = None
+    for df in frames.values():
+        index = df.index if index is None else index.union(df.index)
+    symbols = list(frames)
+    shape = (len(index), len(symbols))
+    close = np.zeros(shape, dtype=np.float64, order='F')
+    buy = np.zeros(shape, dtype=bool, order='F')
+    sell = np.zeros(shape, dtype=bool, order='F')
+    last = np.full(len(symbols), -1, dtype=np.int64)
+    for col, symbol in enumerate(symbols):
+        df = frames[symbol]
+        rows = index.get_indexer(df.index)
+        values = np.full(len(index), np.nan)
+        values[rows] = df['Close'].to_numpy(dtype=np.float64)
+        close[:, col] = np.nan_to_num(pd.Series(values).ffill().to_numpy(), nan=0.0)
+        buy[rows, col] = df['Buy_Signal'].to_numpy() == 1
+        sell[rows, col] = df['Sell_Signal'].to_numpy() == 1
+        if len(rows):
+            last[col] = rows.max()
+    return index, close, buy, sell, last
+
+
+def _next_true_columns(mask):
+    """
+    Like _next_true for every column of a 2-D mask, with a sentinel row so row n is valid.
+    """
+    n = mask.shape[0]
+    rows = np.arange(n)[:, None]
+    idx = np.where(mask, rows, n)
+    idx = np.minimum.accumulate(idx[::-1], axis=0)[::-1]
+    return np.asfortranarray(np.vstack([idx, np.full((1, mask.shape[1]), n)]))
+
+
+def simulate_portfolio(close, buy, sell, initial_capital=10000, position_size=0.1, max_positions=5,
+                       fee_rate=0.001, slippage_pct=0.0005, stop_loss_pct=0.02, take_profit_pct=0.04, last=None):
+    """
+    Run the entry/exit rules of backtest_strategy over many symbols sharing one cash balance.
+
+    Entries and exits are processed in time order, exits first on the same bar. Each
+    entry invests position_size of current equity (capped by cash) while fewer than
+    max_positions are open; otherwise the signal is skipped. Fills pay slippage_pct on
+    the close and fee_rate on the notional. A position still open at its symbol's last
+    bar (last[col], default the final row) is closed there with reason 'End'. Returns
+    (positions, skipped) where positions is a POSITION_DTYPE record array in exit order;
+    cost and proceeds include fees.
+    """
+    n, n_symbols = close.shape
+    if last is None:
+        last = np.full(n_symbols, n - 1)
+    next_buy = _next_true_columns(buy)
+    next_sell = _next_true_columns(sell)
+
+    entries = [(next_buy[0, col], col) for col in range(n_symbols) if next_buy[0, col] < n]
+    heapq.heapify(entries)
+    exits = []
+    open_positions = {}
+    cash = float(initial_capital)
+    closed = []
+    skipped = 0
+
+    while entries or exits:
+        if exits and (not entries or exits[0][0] <= entries[0][0]):
+            j, col, reason = heapq.heappop(exits)
+            entry, quantity, entry_price, cost = open_positions.pop(col)
+            exit_price = close[j, col] * (1 - slippage_pct)
+            proceeds = quantity * exit_price * (1 - fee_rate)
+            cash += proceeds
+            closed.append((col, entry, j, reason, quantity, entry_price, exit_price, cost, proceeds))
+            if next_buy[j + 1, col] < n:
+                heapq.heappush(entries, (next_buy[j + 1, col], col))
+            continue
+
+        i, col = heapq.heappop(entries)
+        if len(open_positions) < max_positions and close[i, col] > 0:
+            equity = cash + sum(p[1] * close[i, c] for c, p in open_positions.items())
+            cost = min(cash, equity * position_size)
+            entry_price = close[i, col] * (1 + slippage_pct)
+            quantity = cost / (entry_price * (1 + fee_rate))
+            if quantity > 0:
+                cash -= cost
+                open_positions[col] = (i, quantity, entry_price, cost)
+                end = last[col] + 1
+                j, reason = trade_exit(close[:end, col], i, next_sell[:end, col], stop_loss_pct, take_profit_pct)
+                heapq.heappush(exits, (j, col, reason))
+                continue
+        skipped += 1
+        if next_buy[i + 1, col] < n:
+            heapq.heappush(entries, (next_buy[i + 1, col], col))
+    return np.array(closed, dtype=POSITION_DTYPE), skipped
+
+
+def equity_curve(close, positions, initial_capital):
+    """
+    Return (cash, equity, drawdown) arrays over all bars, built from positions without a bar loop.
+
+    Open positions are marked to market at the close; drawdown is equity over its running peak minus 1.
+    """
+    n, n_symbols = close.shape
+    cash_delta = np.zeros(n)
+    np.add.at(cash_delta, positions['entry'], -positions['cost'])
+    np.add.at(cash_delta, positions['exit'], positions['proceeds'])
+    held = np.zeros((n, n_symbols))
+    np.add.at(held, (positions['entry'], positions['symbol']), positions['quantity'])
+    np.add.at(held, (positions['exit'], positions['symbol']), -positions['quantity'])
+
+    cash = initial_capital + np.cumsum(cash_delta)
+    equity = cash + np.einsum('ij,ij->i', np.cumsum(held, axis=0), close)
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+    return cash, equity, drawdown
+
+
+def backtest_portfolio(frames, initial_capital=10000, position_size=0.1, max_positions=5, fee_rate=0.001,
+                       slippage_pct=0.0005, stop_loss_pct=0.02, take_profit_pct=0.04):
+    """
+    Backtest several symbols' signal frames as one portfolio sharing initial_capital.
+
+    frames maps symbol to a DataFrame with Close, Buy_Signal and Sell_Signal columns.
+    Returns a dict with per-symbol trades (in the backtest_strategy format plus Quantity)
+    and profits, an equity frame (Equity, Cash, Drawdown) on the aligned index and a
+    summary of the run.
+    """
+    symbols = list(frames)
+    index, close, buy, sell, last = align_frames(frames)
+    positions, skipped = simulate_portfolio(close, buy, sell, initial_capital, position_size, max_positions,
+                                            fee_rate, slippage_pct, stop_loss_pct, take_profit_pct, last)
+    cash, equity, drawdown = equity_curve(close, positions, initial_capital)
+
+    trades = {symbol: [] for symbol in symbols}
+    profits = dict.fromkeys(symbols, 0.0)
+    order = np.argsort(positions['entry'], kind='stable')
+    for p in positions[order].tolist():
+        symbol, entry, exit_, reason, quantity, entry_price, exit_price, cost, proceeds = p
+        profit = proceeds - cost
+        trades[symbols[symbol]].append({'Type': 'Buy', 'Price': entry_price, 'Date': index[entry], 'Quantity': quantity})
+        trades[symbols[symbol]].append({'Type': 'Sell', 'Price': exit_price, 'Date': index[exit_], 'Quantity': quantity,
+                                        'Profit': profit, 'Reason': reason})
+        profits[symbols[symbol]] += profit
+
+    fees = positions['cost'] - positions['quantity'] * positions['entry_price'] \
+        + positions['quantity'] * positions['exit_price'] - positions['proceeds']
+    final_equity = float(equity[-1]) if len(equity) else float(initial_capital)
+    summary = {
+        "symbols": symbols,
+        "bars": len(index),
+        "initial_capital": initial_capital,
+        "final_equity": final_equity,
+        "profit": final_equity - initial_capital,
+        "return_pct": (final_equity / initial_capital - 1) * 100,
+        "max_drawdown_pct": float(drawdown.min()) * 100 if len(drawdown) else 0.0,
+        "trades": len(positions),
+        "win_rate": float((positions['proceeds'] > positions['cost']).mean()) if len(positions) else 0.0,
+        "fees": float(fees.sum()),
+        "skipped_signals": skipped
+    }
+    equity_frame = pd.DataFrame({"Equity": equity, "Cash": cash, "Drawdown": drawdown},
+                                index=pd.Index(index, name="Date"))
+    return {"trades": trades, "profits": profits, "equity": equity_frame, "summary": summary}
+
+
+def run_portfolio(client, symbols, timeframe, start_str, store=None, fetch_workers=8, compute_workers=None,
+                  cache=None, token=None, **kwargs):
+    """
+    Fetch every symbol, compute its signals on the process pool and backtest them as one portfolio.
+
+    With a signal cache, symbols whose prices were seen before reuse their signals, so
+    a re-run with other money-management settings only repeats the portfolio simulation.
+    Extra keyword arguments are passed to backtest_portfolio.
+    """
+    pool = get_process_pool(compute_workers) if compute_workers != 0 else None
+    with ThreadPoolExecutor(max_workers=min(fetch_workers, len(symbols))) as fetcher:
+        fetched = fetcher.map(lambda symbol: get_historical_data(client, symbol, timeframe, start_str, store=store),
+                              symbols)
+        pending = []
+        for df in fetched:
+            check_cancelled(token, [arrays for _, _, arrays in pending if hasattr(arrays, 'cancel')])
+            key = signals_key(df, timeframe) if cache is not None else None
+            arrays = cache.get(key) if cache is not None else None
+            if arrays is None:
+                arrays = timed_signal_arrays(df, timeframe) if pool is None else pool.submit(timed_signal_arrays, df, timeframe)
+            pending.append((df, key, arrays))
+
+    frames = {}
+    for symbol, (df, key, arrays) in zip(symbols, pending):
+        check_cancelled(token, [arrays for _, _, arrays in pending if hasattr(arrays, 'cancel')])
+        if not isinstance(arrays, dict):
+            arrays, timing = arrays if isinstance(arrays, tuple) else arrays.result()
+            # Only computed signals are timed; the download is recorded as kline_fetch
+            for stage, seconds in timing.items():
+                observe_stage(stage, seconds, bars=len(df))
+            if cache is not None:
+                cache.put(key, arrays)
+        frames[symbol] = with_signals(df, arrays)[SIGNAL_COLUMNS]
+
+    start = time.perf_counter()
+    result = backtest_portfolio(frames, **kwargs)
+    observe_stage('portfolio', time.perf_counter() - start, bars=result["summary"]["bars"] * len(symbols))
+    return result
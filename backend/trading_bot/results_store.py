@@ -0,0 +1,170 @@
+import json
+import os
+import shutil
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from .metrics import span
+
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'results')
+
+TRADE_DTYPE = np.dtype([
+    ('Date', 'datetime64[ms]'),
+    ('Type', 'U4'),
+    ('Price', 'f8'),
+    ('Profit', 'f8'),
+    ('Reason', 'U11')
+])
+TRADE_COLUMNS = list(TRADE_DTYPE.names)
+
+
+def trades_to_records(trades):
+    """
+    Convert a backtest trade list into a typed NumPy record array.
+
+    Buy rows have NaN Profit and an empty Reason.
+    """
+    records = np.empty(len(trades), dtype=TRADE_DTYPE)
+    for i, trade in enumerate(trades):
+        records[i] = (
+            np.datetime64(pd.Timestamp(trade['Date']).to_datetime64(), 'ms'),
+            trade['Type'],
+            trade['Price'],
+            trade.get('Profit', np.nan),
+            trade.get('Reason', '')
+        )
+    return records
+
+
+def records_to_trades(records, columns=None):
+    """
+    Convert trade records back into trade dicts, optionally keeping only some columns.
+
+    Buy rows leave out Profit and Reason, as backtest_strategy does.
+    """
+    columns = [c for c in (columns or TRADE_COLUMNS) if c in TRADE_COLUMNS]
+    values = {
+        'Date': np.datetime_as_string(records['Date'], unit='ms', timezone='UTC').tolist() if 'Date' in columns else None,
+        'Type': records['Type'].tolist(),
+        'Price': records['Price'].tolist() if 'Price' in columns else None,
+        'Profit': records['Profit'].tolist() if 'Profit' in columns else None,
+        'Reason': records['Reason'].tolist() if 'Reason' in columns else None
+    }
+    trades = []
+    for i, trade_type in enumerate(values['Type']):
+        trade = {}
+        for column in columns:
+            if trade_type == 'Buy' and column in ('Profit', 'Reason'):
+                continue
+            trade[column] = values[column][i]
+        trades.append(trade)
+    return trades
+
+
+class ResultStore:
+    """
+    Columnar store for bot and backtest results, one directory per run.
+
+    Each run holds the indicator/signal frames as Feather files, the trades as typed
+    record arrays in a compressed .npz, and a small JSON manifest with the keys and
+    profits. Reads are memory-mapped and can be paginated and column-selected.
+    """
+
+    def __init__(self, root=DEFAULT_RESULTS_DIR, max_runs=20):
+        self.root = root
+        self.max_runs = max_runs
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _run_dir(self, run_id):
+        return os.path.join(self.root, run_id)
+
+    def save_run(self, run_id, trades, profits, frames=None, series=None):
+        """
+        Persist one run: trades and profits keyed like {key: ...}, plus optional DataFrames.
+
+        series maps keys to the {"symbol": ..., "timeframe": ...} they were computed on.
+        """
+        run_dir = self._run_dir(run_id)
+        os.makedirs(run_dir, exist_ok=True)
+        keys = list(trades)
+
+        with span('serialization'):
+            np.savez_compressed(os.path.join(run_dir, 'trades.npz'),
+                                **{key: trades_to_records(trades[key]) for key in keys})
+            for key, df in (frames or {}).items():
+                table = pa.Table.from_pandas(df.reset_index(), preserve_index=False)
+                feather.write_feather(table, os.path.join(run_dir, f"{key}.feather"), compression='uncompressed')
+
+            manifest = {"run_id": run_id, "keys": keys, "profits": [float(p) for p in profits],
+                        "frames": list(frames or {}), "series": series or {}}
+            with open(os.path.join(run_dir, 'manifest.json'), 'w') as f:
+                json.dump(manifest, f)
+        self._prune()
+        return manifest
+
+    def _prune(self):
+        with self._lock:
+            runs = sorted(
+                (entry for entry in os.scandir(self.root) if entry.is_dir()),
+                key=lambda entry: entry.stat().st_mtime
+            )
+            for entry in runs[:max(0, len(runs) - self.max_runs)]:
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def has_run(self, run_id):
+        return os.path.exists(os.path.join(self._run_dir(run_id), 'manifest.json'))
+
+    def manifest(self, run_id):
+        with open(os.path.join(self._run_dir(run_id), 'manifest.json')) as f:
+            return json.load(f)
+
+    def read_trades(self, run_id, key, offset=0, limit=None):
+        """
+        Return a slice of one key's trade records.
+        """
+        with np.load(os.path.join(self._run_dir(run_id), 'trades.npz')) as data:
+            records = data[key]
+        stop = None if limit is None else offset + limit
+        return records[offset:stop], len(records)
+
+    def trades(self, run_id, key, columns=None):
+        """
+        Return one key's trades as dicts, in the format produced by backtest_strategy.
+        """
+        records, _ = self.read_trades(run_id, key)
+        return records_to_trades(records, columns)
+
+    def iter_trades_json(self, run_id, keys=None, offset=0, limit=None, columns=None, chunk_size=1000):
+        """
+        Yield a {"trades": {key: [...]}, "total": {...}} JSON document in chunks.
+
+        offset and limit apply to each key's trade list.
+        """
+        keys = keys or self.manifest(run_id)["keys"]
+        totals = {}
+        yield '{"trades": {'
+        for n, key in enumerate(keys):
+            records, totals[key] = self.read_trades(run_id, key, offset, limit)
+            yield ('' if n == 0 else ', ') + json.dumps(key) + ': ['
+            for start in range(0, len(records), chunk_size):
+                chunk = records_to_trades(records[start:start + chunk_size], columns)
+                body = json.dumps(chunk)[1:-1]
+                if body:
+                    yield (', ' if start else '') + body
+            yield ']'
+        yield '}, "total": ' + json.dumps(totals) + '}'
+
+    def read_frame(self, run_id, key, columns=None, offset=0, limit=None):
+        """
+        Read selected columns and rows of a stored frame without loading the rest.
+        """
+        if columns is not None and 'Date' not in columns:
+            columns = ['Date'] + list(columns)
+        table = feather.read_table(os.path.join(self._run_dir(run_id), f"{key}.feather"),
+                                   columns=columns, memory_map=True)
+        return table.slice(offset, limit).to_pandas().set_index('Date')
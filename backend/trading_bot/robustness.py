@@ -0,0 +1,240 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from .jobs import check_cancelled
+from .optimize import (
+    INDICATOR_PARAMS,
+    SIGNAL_KEYS,
+    indicator_arrays,
+    optimize_strategy,
+    signal_masks,
+    trade_metrics
+)
+from .parallel import attached_array, get_process_pool, share_array
+from .signal_cache import cached_signals
+from .trading_bot import get_historical_data, backtest_strategy, simulate_trades
+
+MONTE_CARLO_METHODS = ('bootstrap', 'shuffle')
+
+# Upper bound on simulated paths x trades held in memory by one Monte Carlo batch
+MONTE_CARLO_CELLS = 4_000_000
+
+
+def walk_forward_windows(n, train_bars, test_bars, step_bars=None):
+    """
+    Return (train_start, test_start, test_end) bar offsets of rolling windows over n bars.
+
+    Windows advance by step_bars, which defaults to test_bars so test periods do not overlap.
+    """
+    if train_bars <= 0 or test_bars <= 0:
+        raise ValueError("train_bars and test_bars must be positive.")
+    step_bars = step_bars or test_bars
+    return [(start, start + train_bars, start + train_bars + test_bars)
+            for start in range(0, n - train_bars - test_bars + 1, step_bars)]
+
+
+def _evaluate_window(close, timeframe, grid, window, initial_capital):
+    train_start, test_start, test_end = window
+    train = pd.DataFrame({'Close': close[train_start:test_start]})
+    best = optimize_strategy(train, timeframe, grid, initial_capital=initial_capital, top=1).iloc[0].to_dict()
+
+    # Indicators run over train + test so the test period starts with warmed-up values
+    series = pd.Series(close[train_start:test_end])
+    indicators = indicator_arrays(series, **{key: int(best[key]) if key != 'bb_std' else best[key]
+                                              for key in INDICATOR_PARAMS})
+    buy, sell = signal_masks(series.to_numpy(), indicators, pd.DataFrame([best])[list(SIGNAL_KEYS)])
+    offset = test_start - train_start
+    test_close = close[test_start:test_end]
+    trades = simulate_trades(test_close, buy[0, offset:], sell[0, offset:],
+                             best['stop_loss_pct'], best['take_profit_pct'])
+    result = {key: best[key] for key in list(INDICATOR_PARAMS) + list(SIGNAL_KEYS) + ['stop_loss_pct', 'take_profit_pct']}
+    result['train_profit'] = best['total_profit']
+    result.update({f"test_{key}": value for key, value in trade_metrics(test_close, trades, initial_capital).items()})
+    return result
+
+
+def walk_forward_window(descriptor, timeframe, grid, window, initial_capital=10000):
+    """
+    Optimize on one window's training bars and score the best parameters on its test bars.
+
+    Runs in a pool worker; the close prices are read from shared memory.
+    """
+    with attached_array(descriptor) as close:
+        return _evaluate_window(close, timeframe, grid, window, initial_capital)
+
+
+def walk_forward(df, timeframe, grid, train_bars, test_bars, step_bars=None, initial_capital=10000, workers=None,
+                 token=None):
+    """
+    Run a rolling walk-forward optimization over one price series.
+
+    Each window is optimized on train_bars and the winning parameters are traded,
+    untouched, on the following test_bars. Windows run on the shared process pool
+    (inline when workers is 0) and read the close prices from one shared memory block.
+    Returns a DataFrame with one row per window: dates, chosen parameters, in-sample
+    profit and out-of-sample metrics.
+    """
+    close = df['Close'].to_numpy(dtype=np.float64)
+    windows = walk_forward_windows(len(close), train_bars, test_bars, step_bars)
+    if not windows:
+        raise ValueError(f"Series of {len(close)} bars is too short for {train_bars} + {test_bars} bar windows.")
+
+    if workers == 0:
+        rows = []
+        for window in windows:
+            check_cancelled(token)
+            rows.append(_evaluate_window(close, timeframe, grid, window, initial_capital))
+    else:
+        pool = get_process_pool(workers)
+        shm, descriptor = share_array(close)
+        try:
+            futures = [pool.submit(walk_forward_window, descriptor, timeframe, grid, window, initial_capital)
+                       for window in windows]
+            rows = []
+            for future in futures:
+                check_cancelled(token, futures)
+                rows.append(future.result())
+        finally:
+            shm.close()
+            shm.unlink()
+
+    index = df.index
+    for row, (train_start, test_start, test_end) in zip(rows, windows):
+        row['train_start'] = index[train_start]
+        row['test_start'] = index[test_start]
+        row['test_end'] = index[test_end - 1]
+    columns = ['train_start', 'test_start', 'test_end']
+    result = pd.DataFrame(rows)
+    return result[columns + [c for c in result.columns if c not in columns]]
+
+
+def trade_profits(trades):
+    """
+    Return the Profit of every closed trade in a backtest_strategy trade list as an array.
+    """
+    return np.array([trade['Profit'] for trade in trades if trade['Type'] == 'Sell'], dtype=np.float64)
+
+
+def _simulate_paths(profits, iterations, method, seed, initial_capital):
+    rng = np.random.default_rng(seed)
+    n = len(profits)
+    final = np.empty(iterations)
+    drawdown = np.empty(iterations)
+    batch = max(1, MONTE_CARLO_CELLS // max(n, 1))
+    for start in range(0, iterations, batch):
+        size = min(batch, iterations - start)
+        if method == 'bootstrap':
+            paths = profits[rng.integers(0, n, size=(size, n))]
+        else:
+            paths = rng.permuted(np.broadcast_to(profits, (size, n)), axis=1)
+        equity = initial_capital + np.cumsum(paths, axis=1)
+        peak = np.maximum(np.maximum.accumulate(equity, axis=1), initial_capital)
+        final[start:start + size] = equity[:, -1] - initial_capital
+        drawdown[start:start + size] = (peak - equity).max(axis=1)
+    return final, drawdown
+
+
+def monte_carlo_batch(descriptor, iterations, method, seed, initial_capital=10000):
+    """
+    Simulate one batch of resampled trade sequences in a pool worker.
+
+    Returns (final profit, max drawdown) arrays with one value per path.
+    """
+    with attached_array(descriptor) as profits:
+        return _simulate_paths(profits, iterations, method, seed, initial_capital)
+
+
+def _summarize(values, confidence):
+    tail = (1 - confidence) / 2 * 100
+    low, median, high = np.percentile(values, [tail, 50, 100 - tail])
+    return {"mean": float(values.mean()), "median": float(median), "low": float(low), "high": float(high)}
+
+
+def monte_carlo(profits, iterations=5000, method='bootstrap', initial_capital=10000, confidence=0.95,
+                seed=None, workers=None, token=None):
+    """
+    Resample a trade profit sequence to get confidence intervals on profit and drawdown.
+
+    'bootstrap' draws trades with replacement; 'shuffle' permutes their order, which
+    keeps the total profit but varies the drawdown. Paths are split into batches across
+    the shared process pool (inline when workers is 0), each with an independent seed.
+    """
+    if method not in MONTE_CARLO_METHODS:
+        raise ValueError(f"Unknown Monte Carlo method: {method}")
+    if iterations < 1:
+        raise ValueError("iterations must be at least 1.")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1.")
+    profits = np.asarray(profits, dtype=np.float64)
+    if len(profits) == 0:
+        raise ValueError("No closed trades to resample.")
+
+    batches = 1 if workers == 0 else min(iterations, workers or os.cpu_count())
+    sizes = [len(part) for part in np.array_split(np.arange(iterations), batches)]
+    seeds = np.random.SeedSequence(seed).spawn(batches)
+    if workers == 0:
+        parts = [_simulate_paths(profits, sizes[0], method, seeds[0], initial_capital)]
+    else:
+        pool = get_process_pool(workers)
+        shm, descriptor = share_array(profits)
+        try:
+            futures = [pool.submit(monte_carlo_batch, descriptor, size, method, seq, initial_capital)
+                       for size, seq in zip(sizes, seeds)]
+            parts = []
+            for future in futures:
+                check_cancelled(token, futures)
+                parts.append(future.result())
+        finally:
+            shm.close()
+            shm.unlink()
+
+    final = np.concatenate([part[0] for part in parts])
+    drawdown = np.concatenate([part[1] for part in parts])
+    return {
+        "method": method,
+        "iterations": iterations,
+        "trades": len(profits),
+        "confidence": confidence,
+        "observed_profit": float(profits.sum()),
+        "profit": _summarize(final, confidence),
+        "max_drawdown": _summarize(drawdown, confidence),
+        "probability_of_loss": float((final < 0).mean())
+    }
+
+
+def run_walk_forward(client, symbol, timeframe, start_str, grid, train_bars, test_bars, step_bars=None,
+                     initial_capital=10000, store=None, token=None):
+    """
+    Fetch one price series (through the kline store when given) and walk it forward.
+    """
+    started = time.perf_counter()
+    df = get_historical_data(client, symbol, timeframe, start_str, store=store)
+    windows = walk_forward(df, timeframe, grid, train_bars, test_bars, step_bars, initial_capital, token=token)
+    return {
+        "symbol": symbol,
+        "timeframe": timeframe,
+        "bars": len(df),
+        "elapsed": time.perf_counter() - started,
+        "test_profit": float(windows['test_total_profit'].sum()),
+        "windows": windows.astype({'train_start': str, 'test_start': str, 'test_end': str}).to_dict(orient='records')
+    }
+
+
+def run_monte_carlo(client, symbol, timeframe, start_str, iterations=5000, method='bootstrap',
+                    initial_capital=10000, confidence=0.95, store=None, cache=None, token=None):
+    """
+    Backtest one price series with the default strategy and resample its trades.
+
+    Indicators and signals come from the signal cache when one is given.
+    """
+    started = time.perf_counter()
+    df = get_historical_data(client, symbol, timeframe, start_str, store=store)
+    df, _ = cached_signals(df, timeframe, cache)
+    trades, _ = backtest_strategy(df, initial_capital=initial_capital)
+    check_cancelled(token)
+    result = monte_carlo(trade_profits(trades), iterations, method, initial_capital, confidence, token=token)
+    return {"symbol": symbol, "timeframe": timeframe, "bars": len(df),
+            "elapsed": time.perf_counter() - started, **result}
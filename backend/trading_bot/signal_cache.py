@@ -0,0 +1,68 @@
+import hashlib
+import json
+
+import numpy as np
+
+from .klines import OHLCV_COLUMNS
+from .optimize import INDICATOR_PARAMS
+from .trading_bot import compute_indicators, generate_signals, get_signal_params
+
+
+def fingerprint(df):
+    """
+    Return a hex digest of a price frame's timestamps and OHLCV columns.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(df.index.to_numpy().astype('datetime64[ns]').astype(np.int64)).data)
+    for column in OHLCV_COLUMNS:
+        if column in df.columns:
+            digest.update(column.encode())
+            digest.update(np.ascontiguousarray(df[column].to_numpy(dtype=np.float64)).data)
+    return digest.hexdigest()
+
+
+def signals_key(df, timeframe, params=None):
+    """
+    Return the cache key of the indicators and signals of df: its fingerprint plus every parameter they depend on.
+    """
+    settings = json.dumps({"indicators": INDICATOR_PARAMS, "signals": get_signal_params(timeframe, params)},
+                          sort_keys=True, default=str)
+    return hashlib.blake2b(f"{fingerprint(df)}:{settings}".encode(), digest_size=16).hexdigest()
+
+
+def added_arrays(source, frame):
+    """
+    Return the columns of frame that source does not have, as {name: ndarray}.
+    """
+    return {column: frame[column].to_numpy() for column in frame.columns if column not in source.columns}
+
+
+def signal_arrays(df, timeframe, params=None):
+    """
+    Run compute_indicators and generate_signals and return only the columns they added, as arrays.
+    """
+    return added_arrays(df, generate_signals(compute_indicators(df, timeframe), timeframe, params))
+
+
+def with_signals(df, arrays):
+    """
+    Return df with cached indicator and signal arrays attached as columns.
+    """
+    return df.assign(**arrays)
+
+
+def cached_signals(df, timeframe, cache=None, params=None):
+    """
+    Return df with indicators and signals, computing them only on a cache miss.
+
+    Returns (frame, hit). Without a cache this is compute_indicators plus generate_signals.
+    """
+    if cache is None:
+        return with_signals(df, signal_arrays(df, timeframe, params)), False
+    key = signals_key(df, timeframe, params)
+    arrays = cache.get(key)
+    hit = arrays is not None
+    if not hit:
+        arrays = signal_arrays(df, timeframe, params)
+        cache.put(key, arrays)
+    return with_signals(df, arrays), hit
@@ -0,0 +1,190 @@
+import numpy as np
+
+from .trading_bot import get_signal_params
+
+
+class RingBuffer:
+    """
+    Fixed-size buffer holding the most recent values of a series.
+    """
+
+    def __init__(self, size):
+        self.values = np.empty(size, dtype=np.float64)
+        self.size = size
+        self.count = 0
+        self._pos = 0
+
+    def append(self, value):
+        self.values[self._pos] = value
+        self._pos = (self._pos + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    @property
+    def full(self):
+        return self.count == self.size
+
+
+class StreamingEMA:
+    """
+    EMA seeded with the SMA of its first `length` values, as pandas_ta.ema does by default.
+    """
+
+    def __init__(self, length):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self.value = np.nan
+        self._seed_sum = 0.0
+        self._count = 0
+
+    def update(self, x):
+        self._count += 1
+        if self._count < self.length:
+            self._seed_sum += x
+        elif self._count == self.length:
+            self.value = (self._seed_sum + x) / self.length
+        else:
+            self.value = self.alpha * x + (1 - self.alpha) * self.value
+        return self.value
+
+
+class StreamingRMA:
+    """
+    Wilder moving average matching pandas ewm(alpha=1/length, adjust=True, min_periods=length).
+    """
+
+    def __init__(self, length):
+        self.length = length
+        self.decay = 1.0 - 1.0 / length
+        self._weighted_sum = 0.0
+        self._weight = 0.0
+        self._count = 0
+
+    def update(self, x):
+        self._weighted_sum = x + self.decay * self._weighted_sum
+        self._weight = 1.0 + self.decay * self._weight
+        self._count += 1
+        if self._count < self.length:
+            return np.nan
+        return self._weighted_sum / self._weight
+
+
+class StreamingIndicators:
+    """
+    Incremental Bollinger Bands, RSI and MACD for one series of closes.
+
+    Each update is O(1): the Bollinger window lives in a fixed-size ring buffer and RSI/MACD
+    keep only their running averages. Output keys and values match compute_indicators
+    (pandas_ta) to within floating point tolerance.
+    """
+
+    def __init__(self, bb_length=20, bb_std=2.0, rsi_length=14, macd_fast=12, macd_slow=26, macd_signal=9):
+        self.bb_std = float(bb_std)
+        self.window = RingBuffer(bb_length)
+        self.gain = StreamingRMA(rsi_length)
+        self.loss = StreamingRMA(rsi_length)
+        self.fast = StreamingEMA(macd_fast)
+        self.slow = StreamingEMA(macd_slow)
+        self.signal = StreamingEMA(macd_signal)
+        self.prev_close = None
+        self.bars = 0
+
+        bb_suffix = f"_{bb_length}_{self.bb_std}"
+        macd_suffix = f"_{macd_fast}_{macd_slow}_{macd_signal}"
+        self.columns = {
+            'lower': 'BBL' + bb_suffix, 'mid': 'BBM' + bb_suffix, 'upper': 'BBU' + bb_suffix,
+            'bandwidth': 'BBB' + bb_suffix, 'percent': 'BBP' + bb_suffix, 'rsi': 'RSI',
+            'macd': 'MACD' + macd_suffix, 'hist': 'MACDh' + macd_suffix, 'signal': 'MACDs' + macd_suffix
+        }
+        self.values = {name: np.nan for name in self.columns.values()}
+
+    def update(self, close):
+        """
+        Add one closed bar and return the indicator values for it, keyed like compute_indicators.
+        """
+        close = float(close)
+        self.bars += 1
+        values = self.values
+        cols = self.columns
+
+        # Bollinger Bands (population standard deviation, as pandas_ta uses ddof=0)
+        self.window.append(close)
+        if self.window.full:
+            window = self.window.values
+            mid = window.mean()
+            deviation = self.bb_std * window.std()
+            lower = mid - deviation
+            upper = mid + deviation
+            with np.errstate(divide='ignore', invalid='ignore'):
+                values[cols['bandwidth']] = float(np.float64(100.0) * (upper - lower) / mid)
+                values[cols['percent']] = float(np.float64(close - lower) / (upper - lower))
+            values[cols['lower']] = lower
+            values[cols['mid']] = mid
+            values[cols['upper']] = upper
+
+        # RSI
+        if self.prev_close is not None:
+            change = close - self.prev_close
+            avg_gain = self.gain.update(max(change, 0.0))
+            avg_loss = self.loss.update(min(change, 0.0))
+            denominator = avg_gain + abs(avg_loss)
+            values[cols['rsi']] = 100.0 * avg_gain / denominator if denominator else np.nan
+        self.prev_close = close
+
+        # MACD
+        fast = self.fast.update(close)
+        slow = self.slow.update(close)
+        if not np.isnan(slow):
+            macd = fast - slow
+            signal = self.signal.update(macd)
+            values[cols['macd']] = macd
+            values[cols['signal']] = signal
+            values[cols['hist']] = macd - signal
+
+        return dict(values)
+
+    def seed(self, closes):
+        """
+        Warm the indicators up from a history of closes and return the values for the last one.
+        """
+        values = dict(self.values)
+        for close in closes:
+            values = self.update(close)
+        return values
+
+
+DEFAULT_COLUMNS = StreamingIndicators().columns
+
+
+def evaluate_signals(close, values, timeframe, params=None, columns=None):
+    """
+    Apply the generate_signals rules to a single bar of indicator values.
+
+    Returns (buy, sell) as 0/1 ints; bars whose indicators are not warmed up yet give no signal.
+    """
+    return apply_signal_rules(close, values, get_signal_params(timeframe, params), columns or DEFAULT_COLUMNS)
+
+
+def apply_signal_rules(close, values, params, columns):
+    """
+    evaluate_signals with the signal parameters already resolved by get_signal_params.
+
+    For per-bar callers that resolve params and columns once, up front.
+    """
+    lower = values[columns['lower']]
+    upper = values[columns['upper']]
+    rsi = values[columns['rsi']]
+    macd = values[columns['macd']]
+    macd_signal = values[columns['signal']]
+    proximity = params['bb_proximity']
+
+    buy = (
+        close <= lower + (upper - lower) * proximity and
+        rsi < params['rsi_threshold_buy'] and
+        (not params['macd_condition_buy'] or macd > macd_signal)
+    )
+    sell = (
+        close >= upper - (upper - lower) * proximity and
+        rsi > params['rsi_threshold_sell'] and
+        (not params['macd_condition_sell'] or macd < macd_signal)
+    )
+    return int(buy), int(sell)
@@ -1,18 +1,21 @@
 import pandas as pd
-import pandas_ta as ta
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from binance.client import Client
-from datetime import datetime, timedelta
-from tabulate import tabulate
-from dotenv import load_dotenv
+import logging
 import os
 
+from .klines import to_milliseconds, fetch_klines, ohlcv_frame
+
+# Per-trade log lines; silence with logging.getLogger('trading_bot.trades').setLevel(logging.WARNING)
+trade_logger = logging.getLogger('trading_bot.trades')
+
 def get_binance_client(testnet=False):
     """
     Initialize and return the Binance Client using environment variables.
     """
+    # Imported here so the backtest core does not load the Binance client at startup
+    from binance.client import Client
+    from dotenv import load_dotenv
+
     load_dotenv()  
     api_key = os.getenv('BINANCE_API_KEY')
     secret_key = os.getenv('BINANCE_SECRET_KEY')
@@ -23,25 +26,24 @@ def get_binance_client(testnet=False):
     client = Client(api_key=api_key, api_secret=secret_key, tld="com", testnet=testnet)
     return client
 
-def get_historical_data(client, symbol, interval, start_str):
+def get_historical_data(client, symbol, interval, start_str, store=None):
     """
     Fetch historical klines data from Binance and return as a DataFrame.
+
+    When a KlineStore is given, closed bars are served from the local cache and only
+    the missing ones are downloaded.
     """
-    bars = client.get_historical_klines(symbol=symbol, interval=interval, start_str=start_str)
-    df = pd.DataFrame(bars)
-    df["Date"] = pd.to_datetime(df.iloc[:,0], unit="ms")
-    df.columns = ["Open Time", "Open", "High", "Low", "Close", "Volume",
-                 "Close Time", "Quote Asset Volume", "Number of Trades",
-                 "Taker Buy Base Asset Volume", "Taker Buy Quote Asset Volume", "Ignore", "Date"]
-    df = df[["Date", "Open", "High", "Low", "Close", "Volume"]].copy()
-    df.set_index("Date", inplace=True)
-    df = df.apply(pd.to_numeric, errors="coerce")
-    return df
+    if store is not None:
+        return store.get(client, symbol, interval, start_str)
+    frame = fetch_klines(client, symbol, interval, to_milliseconds(start_str))
+    return ohlcv_frame(frame)
 
 def compute_indicators(df, timeframe):
     """
     Compute technical indicators (Bollinger Bands, RSI, MACD) and add them to the DataFrame.
     """
+    import pandas_ta as ta
+
     # Remove Existing Indicator Columns
     indicator_cols = [
         'BBL_20_2.0', 'BBM_20_2.0', 'BBU_20_2.0', 'BBB_20_2.0', 'BBP_20_2.0',
@@ -64,24 +66,53 @@ def compute_indicators(df, timeframe):
       
     return df
 
-def generate_signals(df, timeframe):
+SIGNAL_PARAMS = {
+    # Stricter conditions for 5-minute timeframe
+    '5m': {
+        'rsi_threshold_buy': 50,
+        'rsi_threshold_sell': 50,
+        'bb_proximity': 0.1,  # 10% proximity
+        'macd_condition_buy': True,
+        'macd_condition_sell': True
+    },
+    # More flexible conditions for 1-hour timeframe
+    '1h': {
+        'rsi_threshold_buy': 55,
+        'rsi_threshold_sell': 45,
+        'bb_proximity': 0.2,  # 20% proximity
+        'macd_condition_buy': False,
+        'macd_condition_sell': False
+    }
+}
+
+SIGNAL_KEYS = ('rsi_threshold_buy', 'rsi_threshold_sell', 'bb_proximity',
+               'macd_condition_buy', 'macd_condition_sell')
+
+def get_signal_params(timeframe, params=None):
+    """
+    Return the signal thresholds for a timeframe, with any overrides from params applied.
+
+    A timeframe missing from SIGNAL_PARAMS needs params to set every key in SIGNAL_KEYS.
+    """
+    merged = dict(SIGNAL_PARAMS.get(timeframe, {}))
+    merged.update(params or {})
+    missing = [key for key in SIGNAL_KEYS if key not in merged]
+    if missing:
+        raise ValueError(f"No signal parameters defined for timeframe: {timeframe} (missing {missing})")
+    return merged
+
+def generate_signals(df, timeframe, params=None):
     """
     Generate buy and sell signals based on Bollinger Bands, RSI, and MACD.
+
+    Thresholds come from SIGNAL_PARAMS for the timeframe; params overrides individual keys.
     """
-    if timeframe == '5m':
-        # Stricter conditions for 5-minute timeframe
-        rsi_threshold_buy = 50
-        rsi_threshold_sell = 50
-        bb_proximity = 0.1  # 10% proximity
-        macd_condition_buy = True
-        macd_condition_sell = True
-    elif timeframe == '1h':
-        # More flexible conditions for 1-hour timeframe
-        rsi_threshold_buy = 55
-        rsi_threshold_sell = 45
-        bb_proximity = 0.2  # 20% proximity
-        macd_condition_buy = False
-        macd_condition_sell = False  
+    params = get_signal_params(timeframe, params)
+    rsi_threshold_buy = params['rsi_threshold_buy']
+    rsi_threshold_sell = params['rsi_threshold_sell']
+    bb_proximity = params['bb_proximity']
+    macd_condition_buy = params['macd_condition_buy']
+    macd_condition_sell = params['macd_condition_sell']
     
     # Buy Signal
     if macd_condition_buy:
@@ -115,9 +146,118 @@ def generate_signals(df, timeframe):
     
     return df
 
-def backtest_strategy(df, initial_capital=10000, stop_loss_pct=0.02, take_profit_pct=0.04):
+def backtest_strategy(df, initial_capital=10000, stop_loss_pct=0.02, take_profit_pct=0.04, engine='vectorized'):
     """
     Backtest the trading strategy on historical data.
+
+    engine='vectorized' runs the NumPy engine; engine='loop' runs the original
+    row-by-row reference implementation. Both return the same trades and profit.
+    """
+    if engine == 'vectorized':
+        return _backtest_vectorized(df, initial_capital, stop_loss_pct, take_profit_pct)
+    if engine == 'loop':
+        return _backtest_loop(df, initial_capital, stop_loss_pct, take_profit_pct)
+    raise ValueError(f"Unknown backtest engine: {engine}")
+
+def _next_true(mask):
+    """
+    For every position, return the index of the next True value in mask (itself included), or len(mask).
+    """
+    n = len(mask)
+    idx = np.where(mask, np.arange(n), n)
+    return np.minimum.accumulate(idx[::-1])[::-1]
+
+def _first_exit(close, start, end, upper, lower):
+    """
+    Return the first index in [start, end) where close leaves the (lower, upper) band, or end.
+    The scan grows geometrically so a trade only touches the bars it actually spans.
+    """
+    step = 64
+    while start < end:
+        stop = min(start + step, end)
+        segment = close[start:stop]
+        hit = (segment >= upper) | (segment <= lower)
+        first = hit.argmax()
+        if hit[first]:
+            return start + int(first)
+        start = stop
+        step *= 2
+    return end
+
+def simulate_trades(close, buy, sell, stop_loss_pct=0.02, take_profit_pct=0.04, next_buy=None, next_sell=None):
+    """
+    Run the entry/exit state machine over NumPy arrays.
+
+    Returns a list of (entry_index, exit_index, reason) tuples. The last trade is closed
+    at the final bar with reason 'End' if it is still open. Callers that reuse the same
+    signals can pass precomputed next_buy/next_sell index arrays.
+    """
+    n = len(close)
+    if n == 0:
+        return []
+    if next_buy is None:
+        next_buy = _next_true(buy)
+    if next_sell is None:
+        next_sell = _next_true(sell)
+    trades = []
+
+    i = next_buy[0]
+    while i < n:
+        j, reason = trade_exit(close, i, next_sell, stop_loss_pct, take_profit_pct)
+        trades.append((i, j, reason))
+        i = next_buy[j + 1] if j + 1 < n else n
+    return trades
+
+def trade_exit(close, entry, next_sell, stop_loss_pct=0.02, take_profit_pct=0.04):
+    """
+    Return (exit_index, reason) for a position opened at close[entry].
+
+    The position is closed at the first take-profit/stop-loss touch or sell signal after
+    entry, or at the final bar with reason 'End'. next_sell may point past the end of close.
+    """
+    n = len(close)
+    buy_price = close[entry]
+    upper = buy_price * (1 + take_profit_pct)
+    lower = buy_price * (1 - stop_loss_pct)
+    signal_exit = min(next_sell[entry + 1], n) if entry + 1 < n else n
+    j = _first_exit(close, entry + 1, signal_exit, upper, lower)
+    if j >= n:
+        return n - 1, 'End'
+    if close[j] >= upper:
+        return j, 'Take-Profit'
+    if close[j] <= lower:
+        return j, 'Stop-Loss'
+    return j, 'Signal'
+
+def _backtest_vectorized(df, initial_capital=10000, stop_loss_pct=0.02, take_profit_pct=0.04):
+    """
+    Backtest the trading strategy with whole-array entry/exit detection.
+    """
+    close = df['Close'].to_numpy(dtype=np.float64)
+    buy = df['Buy_Signal'].to_numpy() == 1
+    sell = df['Sell_Signal'].to_numpy() == 1
+    index = df.index
+
+    capital = initial_capital
+    trades = []
+    log_trades = trade_logger.isEnabledFor(logging.DEBUG)
+    for entry, exit_, reason in simulate_trades(close, buy, sell, stop_loss_pct, take_profit_pct):
+        buy_price = close[entry]
+        sell_price = close[exit_]
+        profit = sell_price - buy_price
+        capital += profit
+        trades.append({'Type': 'Buy', 'Price': buy_price, 'Date': index[entry]})
+        trades.append({'Type': 'Sell', 'Price': sell_price, 'Date': index[exit_], 'Profit': profit, 'Reason': reason})
+        if log_trades:
+            trade_logger.debug("Buy at %s on %s", buy_price, index[entry])
+            trade_logger.debug("Sell at %s on %s | Profit: %.2f USDT | Reason: %s", sell_price, index[exit_], profit, reason)
+
+    total_profit = capital - initial_capital
+    return trades, total_profit
+
+def _backtest_loop(df, initial_capital=10000, stop_loss_pct=0.02, take_profit_pct=0.04):
+    """
+    Reference backtest that walks the DataFrame row by row.
     """
     capital = initial_capital
     position = 0  
@@ -130,7 +270,7 @@ def backtest_strategy(df, initial_capital=10000, stop_loss_pct=0.02, take_profit
             buy_price = row['Close']
             position = 1
             trades.append({'Type': 'Buy', 'Price': buy_price, 'Date': index})
-            print(f"Buy at {buy_price} on {index}")
+            trade_logger.debug("Buy at %s on %s", buy_price, index)
         
         # Sell Signal or Stop-Loss/Take-Profit
         elif position == 1:
@@ -141,7 +281,7 @@ def backtest_strategy(df, initial_capital=10000, stop_loss_pct=0.02, take_profit
                 capital += profit
                 position = 0
                 trades.append({'Type': 'Sell', 'Price': sell_price, 'Date': index, 'Profit': profit, 'Reason': 'Take-Profit'})
-                print(f"Sell at {sell_price} on {index} | Profit: {profit:.2f} USDT | Reason: Take-Profit")
+                trade_logger.debug("Sell at %s on %s | Profit: %.2f USDT | Reason: Take-Profit", sell_price, index, profit)
             # Stop-Loss Check
             elif row['Close'] <= buy_price * (1 - stop_loss_pct):
                 sell_price = row['Close']
@@ -149,7 +289,7 @@ def backtest_strategy(df, initial_capital=10000, stop_loss_pct=0.02, take_profit
                 capital += profit
                 position = 0
                 trades.append({'Type': 'Sell', 'Price': sell_price, 'Date': index, 'Profit': profit, 'Reason': 'Stop-Loss'})
-                print(f"Sell at {sell_price} on {index} | Profit: {profit:.2f} USDT | Reason: Stop-Loss")
+                trade_logger.debug("Sell at %s on %s | Profit: %.2f USDT | Reason: Stop-Loss", sell_price, index, profit)
             # Sell Signal
             elif row['Sell_Signal'] == 1:
                 sell_price = row['Close']
@@ -157,7 +297,7 @@ def backtest_strategy(df, initial_capital=10000, stop_loss_pct=0.02, take_profit
                 capital += profit
                 position = 0
                 trades.append({'Type': 'Sell', 'Price': sell_price, 'Date': index, 'Profit': profit, 'Reason': 'Signal'})
-                print(f"Sell at {sell_price} on {index} | Profit: {profit:.2f} USDT | Reason: Signal")
+                trade_logger.debug("Sell at %s on %s | Profit: %.2f USDT | Reason: Signal", sell_price, index, profit)
     
     # If position still open, sell at last close
     if position == 1:
@@ -165,74 +305,7 @@ def backtest_strategy(df, initial_capital=10000, stop_loss_pct=0.02, take_profit
         profit = sell_price - buy_price
         capital += profit
         trades.append({'Type': 'Sell', 'Price': sell_price, 'Date': df.index[-1], 'Profit': profit, 'Reason': 'End'})
-        print(f"Sell at {sell_price} on {df.index[-1]} | Profit: {profit:.2f} USDT | Reason: End")
+        trade_logger.debug("Sell at %s on %s | Profit: %.2f USDT | Reason: End", sell_price, df.index[-1], profit)
     
     total_profit = capital - initial_capital
     return trades, total_profit
-
-def plot_signals(df, trades, timeframe):
-    """
-    Plot buy and sell signals along with technical indicators.
-    """
-    plt.figure(figsize=(14,7))
-    
-    # Price and Bollinger Bands
-    plt.plot(df['Close'], label='Close Price', color='black')
-    plt.plot(df['BBU_20_2.0'], label='Upper Bollinger Band', color='blue', linestyle='--')
-    plt.plot(df['BBL_20_2.0'], label='Lower Bollinger Band', color='blue', linestyle='--')
-       
-    # Buy signals
-    buys = df[df['Buy_Signal'] == 1]
-    plt.scatter(buys.index, buys['Close'], marker='^', color='green', label='Buy Signal', s=100)
-    
-    # Sell signals
-    sells = df[df['Sell_Signal'] == 1]
-    plt.scatter(sells.index, sells['Close'], marker='v', color='red', label='Sell Signal', s=100)
-    
-    # RSI graph
-    ax1 = plt.gca()
-    ax2 = ax1.twinx()
-    ax2.plot(df['RSI'], label='RSI', color='orange', alpha=0.3)
-    ax2.axhline(30, color='green', linestyle='--', alpha=0.5)
-    ax2.axhline(70, color='red', linestyle='--', alpha=0.5)
-    ax2.set_ylabel('RSI')
-    
-    # MACD graph
-    ax3 = ax1.twinx()
-    ax3.spines['right'].set_position(('outward', 60))  # Shift MACD axis to the right
-    ax3.plot(df['MACD_12_26_9'], label='MACD', color='magenta', alpha=0.3)
-    ax3.plot(df['MACDs_12_26_9'], label='Signal Line', color='cyan', alpha=0.3)
-    ax3.fill_between(df.index, df['MACDh_12_26_9'], color='grey', alpha=0.1, label='MACD Histogram')
-    ax3.set_ylabel('MACD')
-    
-    plt.title(f'ETHUSDT Buy/Sell Signals and Technical Indicators ({timeframe})')
-    plt.xlabel('Date')
-    plt.ylabel('Price (USDT)')
-    plt.legend(loc='upper left')
-    plt.grid()
-    plt.show()
-
-def display_trades(trades, timeframe):
-    """
-    Display trades in a tabular format.
-    """
-    df_trades = pd.DataFrame(trades)
-    if 'Profit' not in df_trades.columns:
-        df_trades['Profit'] = np.nan
-    print(f"\n Transactions in {timeframe} Time Zone::")
-    print(tabulate(df_trades, headers='keys', tablefmt='psql', showindex=False))
-
-def plot_profit_comparison(profits, labels=['5m', '1h']):
-    """
-    Plot a bar chart comparing profits/losses for different timeframes.
-    """
-    plt.figure(figsize=(8,6))
-    bars = plt.bar(labels, profits, color=['green' if p > 0 else 'red' for p in profits])
-    plt.title('Strategy Profit/Loss Comparison')
-    plt.xlabel('Time Zone')
-    plt.ylabel('Profit/Loss (USDT)')
-    plt.axhline(0, color='black', linewidth=0.8)
-    for bar in bars:
-        height = bar.get_height()
-        plt.text(bar.get_x() + bar.get_width()/2.0, height, f'{height:.2f}', ha='center', va='bottom')
-    plt.show()
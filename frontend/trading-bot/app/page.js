@@ -63,8 +63,13 @@ export default function Dashboard() {
         setIsLoading(true);
         try {
             const response = await stopBot();
-            toast.success(response.data.message);
-            setBotStatus(false);
+            // 202: durdurma isteği alındı, bot mevcut aşamasını bitiriyor; durum yoklaması güncelleyecek
+            if (response.status === 202) {
+                toast.info(response.data.message);
+            } else {
+                toast.success(response.data.message);
+                setBotStatus(false);
+            }
         } catch (error) {
             console.error(error);
             toast.error(error.response?.data?.message || 'Error stopping bot.');
@@ -88,8 +93,9 @@ export default function Dashboard() {
             toast.success('Backtest completed successfully.');
         } catch (error) {
             console.error(error);
-            toast.error('Error running backtest.');
-            setError('Error running backtest.');
+            const message = error.cancelled ? 'Backtest was cancelled.' : 'Error running backtest.';
+            toast.error(message);
+            setError(message);
         } finally {
             setIsLoading(false);
         }
@@ -18,12 +18,32 @@ export const stopBot = () => {
     });
 };
 
-export const runBacktest = (payload) => {
-    return axios.post(`${API_BASE_URL}/backtest`, payload, {
+// Backtest arka planda bir iş olarak çalışır; sonuç hazır olana kadar yoklanır.
+// İptal edilen iş 409 döner ve sonucu olmadığından hata olarak fırlatılır.
+export const pollJobResult = async (jobId, intervalMs = 1000) => {
+    for (;;) {
+        const response = await axios.get(`${API_BASE_URL}/jobs/${jobId}/result`, {
+            validateStatus: (status) => status === 200 || status === 202 || status === 409
+        });
+        if (response.status === 409) {
+            const error = new Error(response.data.error || 'Job was cancelled.');
+            error.cancelled = true;
+            throw error;
+        }
+        if (response.status === 200) {
+            return { ...response, data: response.data.result };
+        }
+        await new Promise((resolve) => setTimeout(resolve, intervalMs));
+    }
+};
+
+export const runBacktest = async (payload) => {
+    const response = await axios.post(`${API_BASE_URL}/backtest`, { ...payload, async: true }, {
         headers: {
             'Content-Type': 'application/json'
         }
     });
+    return pollJobResult(response.data.job_id);
 };
 
 export const fetchTrades = () => {
@@ -37,3 +57,10 @@ export const fetchProfit = () => {
 export const fetchResults = () => {
     return axios.get(`${API_BASE_URL}/get_results`);
 };
+
+// Sunucu tarafında piksel genişliğine göre küçültülmüş fiyat serisi ve alım/satım işaretleri
+export const fetchChart = ({ symbol, timeframe, width, method = 'lttb', start, end, jobId }) => {
+    return axios.get(`${API_BASE_URL}/chart`, {
+        params: { symbol, timeframe, width, method, start, end, job_id: jobId }
+    });
+};